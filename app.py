@@ -1,4 +1,8 @@
 import streamlit as st
+from telemetry import start_metrics_server
+
+# Expose /metrics for Prometheus when METRICS_PORT is set (once per process)
+start_metrics_server()
 
 # Initialize session state variables
 if 'current_page' not in st.session_state:
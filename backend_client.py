@@ -0,0 +1,138 @@
+import os
+import json
+import time
+import asyncio
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from telemetry import metrics, span
+
+
+# URL for your Express server (adjust as needed)
+BASE_URL = os.getenv("BACKEND_URL", "http://localhost:3540")
+
+# timeout is (connect, read) in seconds; idempotent calls are safe to repeat after
+# any failure, the rest are only retried when the connection was never made
+ENDPOINTS = {
+    "/t-login": {"timeout": (3.05, 10), "idempotent": False},
+    "/t-signup": {"timeout": (3.05, 10), "idempotent": False},
+    "/t-addgroup": {"timeout": (3.05, 15), "idempotent": False},
+    "/find_groups": {"timeout": (3.05, 10), "idempotent": True},
+    "/assign_tests": {"timeout": (3.05, 60), "idempotent": False},
+    "/pdf_exists": {"timeout": (3.05, 10), "idempotent": True},
+    "/upload_pdf": {"timeout": (3.05, 120), "idempotent": False},
+    "/find_results": {"timeout": (3.05, 30), "idempotent": True},
+    "/retest_pools": {"timeout": (3.05, 30), "idempotent": True},
+}
+DEFAULT_ENDPOINT = {"timeout": (3.05, 30), "idempotent": False}
+
+MAX_RETRIES = int(os.getenv("BACKEND_MAX_RETRIES", "3"))
+BACKOFF_SECONDS = 0.5
+RETRY_STATUS = {502, 503, 504}
+POOL_SIZE = int(os.getenv("BACKEND_POOL_SIZE", "20"))
+LOG_PREVIEW_CHARS = 2000
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    # One keep-alive connection pool per process, shared by every session
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def current_token():
+    # Only available on the Streamlit script thread; background work must pass token=
+    try:
+        import streamlit as st
+
+        return st.session_state.get('token')
+    except Exception:
+        return None
+
+
+def _headers(token, auth, extra):
+    headers = dict(extra or {})
+    if auth:
+        token = token if token is not None else current_token()
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+def preview_for_log(payload, limit=LOG_PREVIEW_CHARS):
+    # Payloads can carry whole quizzes; keep log lines bounded
+    text = json.dumps(payload, default=str)
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... ({len(text)} chars)"
+
+
+def request(method, path, json=None, token=None, auth=True, headers=None, timeout=None, **kwargs):
+    with span("backend_request", endpoint=path):
+        response = _request_with_retries(method, path, json, token, auth, headers, timeout, **kwargs)
+    metrics.inc("backend_requests_total", endpoint=path, status=response.status_code)
+    return response
+
+
+def _request_with_retries(method, path, json, token, auth, headers, timeout, **kwargs):
+    endpoint = ENDPOINTS.get(path, DEFAULT_ENDPOINT)
+    timeout = timeout or endpoint["timeout"]
+    headers = _headers(token, auth, headers)
+    session = get_session()
+
+    for attempt in range(MAX_RETRIES + 1):
+        last_attempt = attempt == MAX_RETRIES
+        try:
+            response = session.request(method, f"{BASE_URL}{path}", json=json, headers=headers, timeout=timeout,
+                                       **kwargs)
+        except requests.exceptions.ConnectTimeout:
+            if last_attempt:
+                raise
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if last_attempt or not endpoint["idempotent"]:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUS or last_attempt or not endpoint["idempotent"]:
+                return response
+        time.sleep(BACKOFF_SECONDS * (2 ** attempt))
+
+
+def post(path, json=None, token=None, auth=True, **kwargs):
+    return request("POST", path, json=json, token=token, auth=auth, **kwargs)
+
+
+async def post_async(path, json=None, token=None, auth=True, **kwargs):
+    # The token is resolved here, on the caller's thread, before handing off
+    if auth and token is None:
+        token = current_token()
+    return await asyncio.to_thread(post, path, json=json, token=token, auth=auth, **kwargs)
+
+
+async def post_many(calls, concurrency=8):
+    # calls is a list of post() keyword dicts; failures are returned in place
+    # as exceptions so one bad call does not cancel the rest of the fan-out
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(call):
+        async with semaphore:
+            try:
+                return await post_async(**call)
+            except requests.exceptions.RequestException as e:
+                return e
+
+    return await asyncio.gather(*(run(call) for call in calls))
+
+
+def post_many_sync(calls, concurrency=8):
+    return asyncio.run(post_many(calls, concurrency=concurrency))
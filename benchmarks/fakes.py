@@ -0,0 +1,170 @@
+"""Local stand-ins for Groq, Pinecone and the Express backend on :3540.
+
+Each fake is a real HTTP server on 127.0.0.1 so the app's own clients
+(groq SDK, pinecone SDK, backend_client) run unmodified against it.
+"""
+import os
+import re
+import sys
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vector_index import InMemoryIndex  # noqa: E402
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    routes = {}
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_body(self):
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            parts = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                parts.append(self.rfile.read(size))
+                self.rfile.readline()
+            return b"".join(parts)
+        return self.rfile.read(int(self.headers.get("Content-Length", 0) or 0))
+
+    def _dispatch(self):
+        body = self._read_body()
+        route = self.routes.get(self.path.split("?")[0])
+        if route is None:
+            status, payload = 404, {"message": "not found"}
+        else:
+            status, payload = route(self, body)
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = _dispatch
+    do_POST = _dispatch
+
+
+def start_server(routes):
+    handler = type("Handler", (_Handler,), {"routes": routes})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _fake_questions(num_questions, question_type):
+    questions = []
+    for i in range(num_questions):
+        if question_type == "MCQ":
+            questions.append({
+                "question": f"Synthetic question {i + 1} about the material?",
+                "answer": "Option A",
+                "options": ["Option A", "Option B", "Option C", "Option D"],
+                "topic": f"Topic {i % 5 + 1}",
+            })
+        else:
+            questions.append({
+                "question": f"Synthetic statement {i + 1} has a ____ in it.",
+                "answer": "blank",
+                "topic": f"Topic {i % 5 + 1}",
+            })
+    return questions
+
+
+class FakeGroq:
+    # OpenAI-compatible /chat/completions that answers with well-formed quiz JSON
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+        self.server, self.url = start_server({"/openai/v1/chat/completions": self.completions})
+
+    def completions(self, handler, body):
+        self.calls += 1
+        request = json.loads(body)
+        prompt = request["messages"][-1]["content"]
+        match = re.search(r"Generate (\d+) (MCQ|Fill in the Blanks) questions", prompt)
+        num_questions, question_type = (int(match.group(1)), match.group(2)) if match else (5, "MCQ")
+        content = json.dumps(_fake_questions(num_questions, question_type), indent=2)
+        time.sleep(self.latency)
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = len(content) // 4
+        return 200, {
+            "id": f"fake-{self.calls}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+
+class FakePinecone:
+    # Data-plane subset of the Pinecone REST API, backed by InMemoryIndex
+    def __init__(self):
+        self.index = InMemoryIndex()
+        self.server, self.url = start_server({
+            "/vectors/upsert": self.upsert,
+            "/query": self.query,
+            "/describe_index_stats": self.describe_index_stats,
+        })
+
+    def upsert(self, handler, body):
+        request = json.loads(body)
+        result = self.index.upsert(request["vectors"], namespace=request.get("namespace", ""))
+        return 200, {"upsertedCount": result["upserted_count"]}
+
+    def query(self, handler, body):
+        request = json.loads(body)
+        result = self.index.query(request["vector"], top_k=request.get("topK", 10),
+                                  namespace=request.get("namespace", ""),
+                                  include_values=request.get("includeValues", False),
+                                  include_metadata=request.get("includeMetadata", False))
+        return 200, {"matches": result["matches"], "namespace": request.get("namespace", "")}
+
+    def describe_index_stats(self, handler, body):
+        stats = self.index.describe_index_stats()
+        return 200, {"namespaces": {name: {"vectorCount": ns["vector_count"]}
+                                    for name, ns in stats["namespaces"].items()},
+                     "totalVectorCount": stats["total_vector_count"], "dimension": 384}
+
+
+class FakeBackend:
+    # The Express routes the Streamlit app calls
+    def __init__(self):
+        self.pdf_hashes = set()
+        self.quizzes = []
+        self.server, self.url = start_server({
+            "/t-login": lambda h, b: (200, {"success": "1", "token": "fake-token"}),
+            "/t-signup": lambda h, b: (200, {"success": "1"}),
+            "/t-addgroup": lambda h, b: (200, {"success": "1"}),
+            "/find_groups": lambda h, b: (200, {"mailId": "instructor@example.com", "groups": ["Group A"]}),
+            "/pdf_exists": self.pdf_exists,
+            "/upload_pdf": self.upload_pdf,
+            "/assign_tests": self.assign_tests,
+        })
+
+    def reset(self):
+        self.pdf_hashes.clear()
+        self.quizzes.clear()
+
+    def pdf_exists(self, handler, body):
+        return 200, {"exists": json.loads(body)["pdf_hash"] in self.pdf_hashes}
+
+    def upload_pdf(self, handler, body):
+        self.pdf_hashes.add(handler.headers.get("X-Content-SHA256"))
+        return 200, {"success": "1", "bytes": len(body)}
+
+    def assign_tests(self, handler, body):
+        self.quizzes.append(json.loads(body))
+        return 200, {"success": "1", "quiz_id": f"quiz-{len(self.quizzes)}"}
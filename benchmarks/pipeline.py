@@ -0,0 +1,216 @@
+"""Times each quiz-generation stage on synthetic PDFs, fully offline.
+
+Groq, Pinecone and the Express backend are replaced by local HTTP fakes
+(benchmarks/fakes.py), so no network or API keys are needed.
+
+    python benchmarks/pipeline.py --output baseline.json
+    python benchmarks/pipeline.py --baseline baseline.json --threshold 0.25
+    python benchmarks/pipeline.py --pages 10 100 --fake-embeddings
+
+Exits with status 1 when any stage regresses past the threshold.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import tempfile
+from collections import defaultdict
+from contextlib import contextmanager
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from fakes import FakeBackend, FakeGroq, FakePinecone  # noqa: E402
+from synthetic_pdf import make_pdf  # noqa: E402
+
+STAGES = [
+    "get_pdf_text",
+    "get_text_chunks",
+    "create_vector_store",
+    "fetch_relevant_documents",
+    "prompt_assembly",
+    "llm_call",
+    "response_parsing",
+    "assign_tests",
+]
+QUERY = "cell membrane transport"
+DIFFICULTY = "Medium"
+QUESTION_TYPE = "MCQ"
+NUM_QUESTIONS = 10
+# Differences smaller than this are timer noise, whatever the ratio says
+NOISE_FLOOR_S = 0.005
+
+
+def configure_environment(args):
+    # Must run before any app module is imported: they read these at import time
+    groq = FakeGroq(latency=args.llm_latency)
+    backend = FakeBackend()
+    os.environ["INSTRUCTOR_CACHE_DIR"] = tempfile.mkdtemp(prefix="quiz-bench-")
+    os.environ["BACKEND_URL"] = backend.url
+    os.environ["GROQ_BASE_URL"] = groq.url
+    os.environ["GROQ_API_KEY"] = "fake"
+    if args.pinecone == "server":
+        pinecone = FakePinecone()
+        os.environ["PINECONE_API_KEY"] = "fake"
+        os.environ["PINECONE_INDEX_HOST"] = pinecone.url
+    else:
+        os.environ["PINECONE_INDEX_BACKEND"] = "memory"
+    return backend
+
+
+def hash_embeddings():
+    # Deterministic bag-of-hashed-words vectors, for timing everything but the model
+    import zlib
+    import numpy as np
+    from langchain_core.embeddings import Embeddings
+
+    class HashEmbeddings(Embeddings):
+        def _embed(self, text):
+            vector = np.zeros(384, dtype=np.float32)
+            for word in text.lower().split():
+                vector[zlib.crc32(word.encode("utf-8")) % 384] += 1.0
+            norm = np.linalg.norm(vector)
+            return (vector / norm if norm else vector).tolist()
+
+        def embed_documents(self, texts):
+            return [self._embed(text) for text in texts]
+
+        def embed_query(self, text):
+            return self._embed(text)
+
+    return HashEmbeddings()
+
+
+@contextmanager
+def timed(timings, stage):
+    start = time.perf_counter()
+    yield
+    timings[stage].append(time.perf_counter() - start)
+
+
+def run_pages(num_pages, repeats, backend):
+    import quiz_generation as qg
+    import pdf_extraction
+    import document_upload
+    from cache import LRUCache
+    from context_packer import pack_chunks
+
+    pdf_binary = make_pdf(num_pages)
+    timings = defaultdict(list)
+    for _ in range(repeats):
+        # Every repeat measures cold work, not the caches added on top of it
+        pdf_extraction.page_cache = LRUCache(max_items=50000, max_bytes=256 * 1024 * 1024)
+        document_upload._known_hashes.clear()
+        backend.reset()
+
+        with timed(timings, "get_pdf_text"):
+            text = qg.get_pdf_text(pdf_binary)
+        with timed(timings, "get_text_chunks"):
+            chunks = qg.get_text_chunks(text)
+        with timed(timings, "create_vector_store"):
+            vector_store, texts, embeddings = qg.create_vector_store(chunks)
+        budget = qg.quiz_context_budget(DIFFICULTY, QUESTION_TYPE, NUM_QUESTIONS)
+        with timed(timings, "fetch_relevant_documents"):
+            qg.fetch_relevant_documents(QUERY, vector_store, qg.CONTEXT_CANDIDATES, budget)
+        with timed(timings, "prompt_assembly"):
+            budget = qg.quiz_context_budget(DIFFICULTY, QUESTION_TYPE, NUM_QUESTIONS)
+            context = pack_chunks(chunks[:qg.CONTEXT_CANDIDATES], budget)[0]
+            qg.build_quiz_prompt(context, DIFFICULTY, QUESTION_TYPE, NUM_QUESTIONS)
+        with timed(timings, "llm_call"):
+            response = qg.generate_quiz_questions(context, DIFFICULTY, QUESTION_TYPE, NUM_QUESTIONS,
+                                                  force_regenerate=True)
+        with timed(timings, "response_parsing"):
+            questions = qg.parse_quiz_response(response)
+        with timed(timings, "assign_tests"):
+            success, message = qg.assign_tests("fake-token", "Group A", questions, "Benchmark quiz", False, 0, 0,
+                                               len(questions), 1, vector_store, texts, "instructor@example.com",
+                                               qg.generate_unique_document_id(), embeddings, pdf_binary)
+        if not success:
+            raise RuntimeError(f"assign_tests failed against the fake backend: {message}")
+
+    return {
+        "pdf_bytes": len(pdf_binary),
+        "chunks": len(chunks),
+        "stages": {
+            stage: {"median_s": statistics.median(runs), "min_s": min(runs), "runs": runs}
+            for stage, runs in timings.items()
+        },
+    }
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for pages, current in results["results"].items():
+        before = baseline.get("results", {}).get(pages)
+        if before is None:
+            continue
+        for stage in STAGES:
+            if stage not in current["stages"] or stage not in before["stages"]:
+                continue
+            now = current["stages"][stage]["median_s"]
+            then = before["stages"][stage]["median_s"]
+            ratio = now / then if then else float("inf")
+            flag = ""
+            if now - then > NOISE_FLOOR_S and ratio > 1 + threshold:
+                flag = "  REGRESSION"
+                regressions.append((pages, stage))
+            print(f"{pages:>5} pages  {stage:<26} {then:9.4f}s -> {now:9.4f}s  x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown per stage as a fraction of the baseline median")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="seconds the fake Groq waits per call")
+    parser.add_argument("--pinecone", choices=["server", "memory"], default="server",
+                        help="fake Pinecone over HTTP, or the in-process InMemoryIndex")
+    parser.add_argument("--fake-embeddings", action="store_true",
+                        help="hash-based embeddings instead of loading the sentence-transformers model")
+    args = parser.parse_args()
+
+    backend = configure_environment(args)
+    if args.fake_embeddings:
+        import quiz_generation
+
+        embeddings = hash_embeddings()
+        quiz_generation.get_embedding_service = lambda model_name=None: embeddings
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeats": args.repeats,
+            "fake_embeddings": args.fake_embeddings,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {str(pages): run_pages(pages, args.repeats, backend) for pages in args.pages},
+    }
+
+    for pages, result in results["results"].items():
+        print(f"{pages} pages ({result['pdf_bytes']} bytes, {result['chunks']} chunks)")
+        for stage in STAGES:
+            print(f"  {stage:<26} {result['stages'][stage]['median_s']:9.4f}s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Measures app.py cold start and time-to-login-page in fresh interpreters.
+
+    python benchmarks/startup.py                       # current working tree
+    python benchmarks/startup.py --ref a089098 --output before.json
+    python benchmarks/startup.py --compare before.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["langchain", "langchain_community", "faiss", "sentence_transformers", "torch", "PyPDF2", "groq",
+                 "pinecone"]
+
+# Runs in a fresh interpreter so nothing is already in sys.modules
+PROBE = r'''
+import sys, time, json
+tree, heavy = sys.argv[1], json.loads(sys.argv[2])
+sys.path.insert(0, tree)
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+at = AppTest.from_file(tree + "/app.py", default_timeout=300)
+at.run()
+rendered = time.perf_counter()
+print(json.dumps({
+    "streamlit_import_s": imported - start,
+    "login_page_s": rendered - imported,
+    "titles": [t.value for t in at.title],
+    "heavy_modules_loaded": [m for m in heavy if m in sys.modules],
+}))
+'''
+
+
+def run_once(tree):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", PROBE, tree, json.dumps(HEAVY_MODULES)], cwd=tree,
+                            capture_output=True, text=True, check=True)
+    sample = json.loads(result.stdout.strip().splitlines()[-1])
+    sample["cold_start_s"] = time.perf_counter() - start
+    return sample
+
+
+def measure(tree, repeats):
+    samples = [run_once(tree) for _ in range(repeats)]
+    return {
+        "tree": tree,
+        "repeats": repeats,
+        "cold_start_s": statistics.median(s["cold_start_s"] for s in samples),
+        "login_page_s": statistics.median(s["login_page_s"] for s in samples),
+        "streamlit_import_s": statistics.median(s["streamlit_import_s"] for s in samples),
+        "titles": samples[-1]["titles"],
+        "heavy_modules_loaded": samples[-1]["heavy_modules_loaded"],
+    }
+
+
+def measure_ref(ref, repeats):
+    with tempfile.TemporaryDirectory() as tmp:
+        tree = os.path.join(tmp, "tree")
+        subprocess.run(["git", "worktree", "add", "--detach", tree, ref], cwd=REPO_ROOT, check=True,
+                       capture_output=True)
+        try:
+            result = measure(tree, repeats)
+        finally:
+            subprocess.run(["git", "worktree", "remove", "--force", tree], cwd=REPO_ROOT, capture_output=True)
+    result["tree"] = ref
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ref", help="git ref to measure instead of the working tree")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results from an earlier run to compare against")
+    args = parser.parse_args()
+
+    result = measure_ref(args.ref, args.repeats) if args.ref else measure(REPO_ROOT, args.repeats)
+    print(json.dumps(result, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            before = json.load(f)
+        for metric in ("cold_start_s", "login_page_s"):
+            change = result[metric] - before[metric]
+            print(f"{metric}: {before[metric]:.3f}s -> {result[metric]:.3f}s ({change:+.3f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Deterministic multi-page text PDFs for benchmarks, without extra dependencies."""
+import random
+
+WORDS = ("cell membrane protein enzyme energy transport diffusion osmosis gradient molecule structure function "
+         "nucleus ribosome synthesis respiration glucose oxygen carbon cycle system process reaction rate "
+         "temperature pressure volume equilibrium constant theory evidence experiment hypothesis result").split()
+LINES_PER_PAGE = 45
+WORDS_PER_LINE = 12
+
+
+def _escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def page_lines(page_number, seed=0):
+    rng = random.Random(seed * 1_000_003 + page_number)
+    lines = [f"Chapter {page_number // 20 + 1}: Course Handout"]
+    for _ in range(LINES_PER_PAGE):
+        lines.append(" ".join(rng.choice(WORDS) for _ in range(WORDS_PER_LINE)) + ".")
+    lines.append(f"Page {page_number + 1}")
+    return lines
+
+
+def make_pdf(num_pages, seed=0):
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for page_number in range(num_pages):
+        text = "BT /F1 10 Tf 12 TL 50 780 Td " + " ".join(
+            f"({_escape(line)}) '" for line in page_lines(page_number, seed)) + " ET"
+        stream = text.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id)
+        page_ids.append(len(objects))
+    kids = " ".join(f"{i} 0 R" for i in page_ids).encode("ascii")
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, num_pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
@@ -0,0 +1,126 @@
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    # In-memory cache bounded by both entry count and approximate size in bytes.
+    def __init__(self, max_items=8, max_bytes=512 * 1024 * 1024):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()  # key -> (value, size)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key][0]
+
+    def put(self, key, value, size=0):
+        with self._lock:
+            if key in self._data:
+                self._size -= self._data.pop(key)[1]
+            if size > self.max_bytes:
+                return  # Never worth evicting everything else for a single entry
+            self._data[key] = (value, size)
+            self._size += size
+            while len(self._data) > self.max_items or self._size > self.max_bytes:
+                _, (_, evicted_size) = self._data.popitem(last=False)
+                self._size -= evicted_size
+
+    def pop(self, key):
+        with self._lock:
+            if key in self._data:
+                value, size = self._data.pop(key)
+                self._size -= size
+                return value
+            return None
+
+    def __len__(self):
+        return len(self._data)
+
+
+class DiskCache:
+    # Pickled entries on local disk, one file per key. Reads bump the file's
+    # mtime so eviction can drop the least recently used entries first; the
+    # write time is stored with the value so ttl (seconds) counts from creation.
+    def __init__(self, directory, max_bytes=2 * 1024 * 1024 * 1024, ttl=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # Entries are unpickled on read, so only the owner may write here
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        os.chmod(directory, 0o700)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                created, value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Partially written or incompatible entry: drop it and treat as a miss
+            self.delete(key)
+            return None
+
+        if self.ttl is not None and time.time() - created > self.ttl:
+            self.delete(key)
+            return None
+        try:
+            os.utime(path, None)
+        except FileNotFoundError:
+            pass
+        return value
+
+    def put(self, key, value):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((time.time(), value), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            total = 0
+            for name in os.listdir(self.directory):
+                if not name.endswith(".pkl"):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, name))
+                total += stat.st_size
+
+            entries.sort()
+            for _, size, name in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+
+def default_cache_dir(name):
+    base = os.getenv("INSTRUCTOR_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "instructor"))
+    return os.path.join(base, name)
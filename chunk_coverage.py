@@ -0,0 +1,64 @@
+import numpy as np
+
+from vector_index import extract_vectors, normalize_rows
+
+
+def farthest_point_order(vectors, k):
+    # Greedy max-min cosine distance: start from the chunk nearest the document
+    # centroid, then repeatedly take the chunk least similar to everything
+    # picked so far. One matrix-vector product per pick.
+    x = normalize_rows(vectors)
+    k = min(k, len(x))
+    if k == 0:
+        return []
+
+    first = int(np.argmax(x @ x.mean(axis=0)))
+    selected = [first]
+    min_distance = 1.0 - x @ x[first]
+    min_distance[first] = -np.inf
+    for _ in range(k - 1):
+        pick = int(np.argmax(min_distance))
+        selected.append(pick)
+        min_distance = np.minimum(min_distance, 1.0 - x @ x[pick])
+        min_distance[selected] = -np.inf
+    return selected
+
+
+def kmeans_representatives(vectors, k, iterations=20):
+    # Spherical k-means seeded with farthest-point picks (deterministic). Returns
+    # the chunk closest to each centroid, largest cluster first.
+    x = normalize_rows(vectors)
+    k = min(k, len(x))
+    if k == 0:
+        return []
+
+    centroids = x[farthest_point_order(x, k)]
+    assignment = None
+    for _ in range(iterations):
+        new_assignment = np.argmax(x @ centroids.T, axis=1)
+        if assignment is not None and np.array_equal(new_assignment, assignment):
+            break
+        assignment = new_assignment
+        # One-hot matmul: much faster than np.add.at for the per-cluster sums
+        sums = np.eye(k, dtype=np.float32)[assignment].T @ x
+        counts = np.bincount(assignment, minlength=k)
+        nonempty = counts > 0
+        centroids[nonempty] = normalize_rows(sums[nonempty])
+
+    similarity = x @ centroids.T
+    counts = np.bincount(assignment, minlength=k)
+    representatives = []
+    for cluster in np.argsort(-counts, kind="stable"):
+        members = np.flatnonzero(assignment == cluster)
+        if len(members):
+            representatives.append(int(members[np.argmax(similarity[members, cluster])]))
+    return representatives
+
+
+def coverage_order(vector_store, k, method="kmeans"):
+    # Indexes into the store's chunks (insertion order) that together cover the
+    # whole document, reusing the vectors FAISS already holds
+    vectors, _ = extract_vectors(vector_store)
+    if method == "farthest":
+        return farthest_point_order(vectors, k)
+    return kmeans_representatives(vectors, k)
@@ -0,0 +1,56 @@
+import os
+import threading
+from functools import lru_cache
+
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+PINECONE_INDEX_NAME = "pdf_vectors"
+
+
+# External clients are built on first use and then shared by every session, so
+# pages that never talk to Groq or Pinecone never import or construct them.
+@lru_cache(maxsize=None)
+def get_groq_client():
+    from groq import Groq
+
+    return Groq(api_key=os.getenv("GROQ_API_KEY"))
+
+
+@lru_cache(maxsize=None)
+def get_pinecone_client():
+    from pinecone import Pinecone
+
+    return Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
+
+
+@lru_cache(maxsize=None)
+def get_pinecone_index():
+    if os.getenv("PINECONE_INDEX_BACKEND") == "memory":
+        from vector_index import InMemoryIndex
+
+        return InMemoryIndex()
+    return get_pinecone_client().Index(PINECONE_INDEX_NAME, host=os.getenv("PINECONE_INDEX_HOST"))
+
+
+_warm_up_lock = threading.Lock()
+_warm_up_started = False
+
+
+def warm_up_embeddings_in_background():
+    # Safe to call on every rerun: only the first call per process starts a
+    # thread, and torch/sentence-transformers are imported inside that thread.
+    global _warm_up_started
+    with _warm_up_lock:
+        if _warm_up_started:
+            return
+        _warm_up_started = True
+
+    def run():
+        from embedding_service import get_embedding_service
+
+        get_embedding_service().warm_up()
+
+    threading.Thread(target=run, daemon=True).start()
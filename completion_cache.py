@@ -0,0 +1,45 @@
+import os
+import hashlib
+import threading
+
+from cache import DiskCache, default_cache_dir
+from telemetry import record_cache
+
+
+class CompletionCache:
+    # LLM completions keyed by the fully assembled prompt and the model name, so
+    # any change to context, difficulty, type or count is a different entry.
+    def __init__(self, directory, ttl, max_bytes):
+        self.store = DiskCache(directory, max_bytes=max_bytes, ttl=ttl)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(prompt, model):
+        return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, prompt, model):
+        completion = self.store.get(self.key(prompt, model))
+        with self._lock:
+            if completion is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        record_cache("completion", "miss" if completion is None else "hit")
+        return completion
+
+    def put(self, prompt, model, completion):
+        self.store.put(self.key(prompt, model), completion)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0}
+
+
+completion_cache = CompletionCache(
+    default_cache_dir("completions"),
+    ttl=float(os.getenv("COMPLETION_CACHE_TTL_HOURS", "168")) * 3600,
+    max_bytes=int(os.getenv("COMPLETION_CACHE_MB", "256")) * 1024 * 1024,
+)
@@ -0,0 +1,93 @@
+import os
+import re
+import threading
+from collections import Counter
+
+
+# llama3-8b-8192 context window, and what to hold back for the model's answer
+CONTEXT_WINDOW = int(os.getenv("QUIZ_CONTEXT_WINDOW", "8192"))
+OUTPUT_TOKENS_PER_QUESTION = {"MCQ": 90, "Fill in the Blanks": 60}
+OUTPUT_TOKEN_MARGIN = 256
+MIN_CONTEXT_TOKENS = 512
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    # Llama 3's tokenizer is built on tiktoken's 100k BPE, so cl100k_base counts
+    # within a few percent of it. Without tiktoken (or its vocab file) we fall
+    # back to the ~4 characters per token rule of thumb.
+    global _encoding, _encoding_loaded
+    with _encoding_lock:
+        if not _encoding_loaded:
+            try:
+                import tiktoken
+
+                _encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception:
+                _encoding = None
+            _encoding_loaded = True
+        return _encoding
+
+
+def count_tokens(text):
+    encoding = _get_encoding()
+    if encoding is None:
+        return -(-len(text) // 4)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text, max_tokens):
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[:max_tokens * 4]
+    return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+
+
+def context_budget(prompt_overhead_tokens, num_questions, question_type, context_window=CONTEXT_WINDOW):
+    # Tokens left for context once the prompt instructions and the answer are reserved
+    reserved = num_questions * OUTPUT_TOKENS_PER_QUESTION.get(question_type, 90) + OUTPUT_TOKEN_MARGIN
+    return max(MIN_CONTEXT_TOKENS, context_window - prompt_overhead_tokens - reserved)
+
+
+_PAGE_NUMBER = re.compile(r"^\s*(page\s*)?\d+(\s*(of|/)\s*\d+)?\s*$", re.IGNORECASE)
+
+
+def strip_boilerplate(chunks):
+    # Drops page numbers, and short lines repeated across the candidates
+    # (running headers and footers), then collapses runs of whitespace
+    line_counts = Counter(line.strip() for chunk in chunks for line in chunk.splitlines() if line.strip())
+    repeated = {line for line, count in line_counts.items() if count >= 3 and len(line) <= 80}
+
+    cleaned = []
+    for chunk in chunks:
+        lines = [
+            line.strip() for line in chunk.splitlines()
+            if line.strip() and line.strip() not in repeated and not _PAGE_NUMBER.match(line)
+        ]
+        cleaned.append(re.sub(r"[ \t]+", " ", "\n".join(lines)))
+    return cleaned
+
+
+def pack_chunks(chunks, budget, compress=False):
+    # chunks are ordered most valuable first. Whole chunks are taken while they
+    # fit; the first one that does not is cut to the remaining budget.
+    # Returns (context, context_tokens, chunks_used).
+    if compress:
+        chunks = strip_boilerplate(chunks)
+
+    packed = []
+    used = 0
+    for chunk in chunks:
+        remaining = budget - used
+        if remaining <= 0:
+            break
+        tokens = count_tokens(chunk)
+        if tokens > remaining:
+            chunk = truncate_to_tokens(chunk, remaining)
+            tokens = count_tokens(chunk)
+        packed.append(chunk)
+        used += tokens
+    return " ".join(packed), used, len(packed)
@@ -2,8 +2,46 @@ import streamlit as st
 import json
 import time
 import requests  # Import the requests library for making HTTP requests
+import backend_client
+from roster_import import iter_roster_rows, parse_roster, submit_groups, apply_outcomes, report_csv, RosterError
+
+def show_bulk_import(group_name):
+    st.write("Upload a CSV or XLSX roster with an email column and, optionally, a group column. "
+             "Rows without a group go into the group named above.")
+    roster = st.file_uploader("Roster file", type=["csv", "xlsx"])
+
+    if st.button("Import Groups"):
+        if roster is None:
+            st.error("Please upload a roster file.")
+            return
+
+        try:
+            groups, report = parse_roster(iter_roster_rows(roster), default_group=group_name.strip())
+        except RosterError as e:
+            st.error(str(e))
+            return
+        if not groups:
+            st.error("No valid emails found in the roster.")
+        else:
+            token = st.session_state.get('token')
+            with st.spinner(f"Creating {len(groups)} group(s)..."):
+                outcomes = submit_groups(groups, token)
+            apply_outcomes(report, outcomes)
+
+            created = [name for name, (ok, _) in outcomes.items() if ok]
+            if created:
+                st.success(f"Created {len(created)} group(s): {', '.join(created)}")
+            for name, (ok, detail) in outcomes.items():
+                if not ok:
+                    st.error(f"Failed to create group '{name}': {detail}")
+
+        problems = [entry for entry in report if entry["status"] not in ("ok", "added")]
+        st.write(f"{len(report)} rows read, {len(problems)} not added.")
+        if problems:
+            st.dataframe(problems, hide_index=True)
+        st.download_button("Download row report (CSV)", report_csv(report), file_name="roster_report.csv",
+                           mime="text/csv")
 
-BASE_URL = "http://localhost:3540"  # Your backend URL
 
 def show_create_groups():
     st.title("Create a New Group")
@@ -11,6 +49,12 @@ def show_create_groups():
     # Input for the group name
     group_name = st.text_input("Group Name")
 
+    # Large classes are imported from a file instead of one input per email
+    mode = st.radio("Add members", ["Enter emails", "Upload roster (CSV/XLSX)"], horizontal=True)
+    if mode != "Enter emails":
+        show_bulk_import(group_name)
+        return
+
     # Initialize email inputs if not already in session state
     if 'emails' not in st.session_state:
         st.session_state.emails = ['']  # Start with one empty input field
@@ -44,18 +88,9 @@ def show_create_groups():
                 # Convert to JSON format (for sending to backend or saving)
                 group_json = json.dumps(group_data)
 
-                # Set the authorization token (retrieved from session state)
-                token = st.session_state.get('token', '')  # Get token from session state
-
-                # Prepare headers for the request
-                headers = {
-                    "Authorization": f"Bearer {token}",
-                    "Content-Type": "application/json"
-                }
-
-                # Send the JSON data to the backend
+                # Send the JSON data to the backend (the bearer token is added from session state)
                 try:
-                    response = requests.post(f"{BASE_URL}/t-addgroup", headers=headers, json=group_data)
+                    response = backend_client.post("/t-addgroup", json=group_data)
 
                     # Check if the request was successful
                     if response.status_code == 200:
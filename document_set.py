@@ -0,0 +1,58 @@
+from langchain_community.vectorstores import FAISS
+
+from vector_index import extract_vectors
+
+
+class DocumentSet:
+    # Several uploaded PDFs behind one FAISS index. Each file is ingested (and
+    # cached) on its own; adding it copies its stored vectors into the combined
+    # index and removing it deletes just its ids, so neither step re-embeds or
+    # rebuilds the other files. Chunks are tagged with their file and page.
+    def __init__(self):
+        self.files = {}  # content hash -> {"name", "text", "ids"}, in upload order
+        self.vector_store = None
+        self.embeddings = None
+
+    def __contains__(self, file_hash):
+        return file_hash in self.files
+
+    def add(self, file_hash, name, ingested):
+        text, _, store, embeddings = ingested
+        ids = []
+        if store is not None:
+            vectors, docs = extract_vectors(store)
+            ids = [f"{file_hash[:16]}-{i}" for i in range(len(docs))]
+            text_embeddings = [(doc.page_content, vector.tolist()) for doc, vector in zip(docs, vectors)]
+            metadatas = [{**(doc.metadata or {}), "source": name, "file_hash": file_hash} for doc in docs]
+            if self.vector_store is None:
+                self.vector_store = FAISS.from_embeddings(text_embeddings, embeddings, metadatas=metadatas, ids=ids)
+                self.embeddings = embeddings
+            else:
+                self.vector_store.add_embeddings(text_embeddings, metadatas=metadatas, ids=ids)
+        self.files[file_hash] = {"name": name, "text": text, "ids": ids}
+
+    def remove(self, file_hash):
+        entry = self.files.pop(file_hash, None)
+        if entry is None or not entry["ids"]:
+            return
+        if self.vector_store.index.ntotal == len(entry["ids"]):
+            # FAISS stores are never left empty; the next add starts a new one
+            self.vector_store = None
+            self.embeddings = None
+        else:
+            self.vector_store.delete(entry["ids"])
+
+    @property
+    def text(self):
+        return "".join(entry["text"] for entry in self.files.values())
+
+    def chunks(self):
+        # In index order, which is what positions from coverage_order refer to
+        store = self.vector_store
+        if store is None:
+            return []
+        return [store.docstore.search(store.index_to_docstore_id[i]).page_content for i in range(store.index.ntotal)]
+
+    def as_ingested(self):
+        # Same shape as ingest_pdf's result: (text, chunks, vector_store, embeddings)
+        return self.text, self.chunks(), self.vector_store, self.embeddings
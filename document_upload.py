@@ -0,0 +1,46 @@
+import hashlib
+import threading
+
+import backend_client
+
+
+UPLOAD_CHUNK_BYTES = 256 * 1024
+
+# Hashes this process has already confirmed the backend holds
+_known_hashes = set()
+_known_lock = threading.Lock()
+
+
+def pdf_content_hash(pdf_binary):
+    return hashlib.sha256(pdf_binary).hexdigest()
+
+
+def _iter_chunks(pdf_binary):
+    view = memoryview(pdf_binary)
+    for start in range(0, len(view), UPLOAD_CHUNK_BYTES):
+        yield bytes(view[start:start + UPLOAD_CHUNK_BYTES])
+
+
+def ensure_pdf_uploaded(pdf_binary, token=None):
+    # Returns the content hash the backend stores the PDF under. The raw bytes
+    # are only sent when the backend does not already have that hash, and then
+    # as a chunked stream rather than base64 inside a JSON body.
+    pdf_hash = pdf_content_hash(pdf_binary)
+    with _known_lock:
+        if pdf_hash in _known_hashes:
+            return pdf_hash
+
+    response = backend_client.post("/pdf_exists", json={"pdf_hash": pdf_hash}, token=token)
+    response.raise_for_status()
+    if not response.json().get("exists"):
+        response = backend_client.post(
+            "/upload_pdf",
+            data=_iter_chunks(pdf_binary),
+            token=token,
+            headers={"Content-Type": "application/pdf", "X-Content-SHA256": pdf_hash},
+        )
+        response.raise_for_status()
+
+    with _known_lock:
+        _known_hashes.add(pdf_hash)
+    return pdf_hash
@@ -0,0 +1,96 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from langchain_core.embeddings import Embeddings
+
+
+DEFAULT_MODEL_NAME = "paraphrase-MiniLM-L6-v2"
+BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+NUM_THREADS = int(os.getenv("EMBEDDING_THREADS", "0"))  # 0 lets torch pick
+USE_WORKER_PROCESS = os.getenv("EMBEDDING_WORKER_PROCESS", "0") == "1"
+
+
+def _load_model(model_name, num_threads):
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    if num_threads:
+        torch.set_num_threads(num_threads)
+    return SentenceTransformer(model_name)
+
+
+# State for the optional worker process; only ever set inside that process
+_worker_model = None
+
+
+def _init_worker(model_name, num_threads):
+    global _worker_model
+    _worker_model = _load_model(model_name, num_threads)
+
+
+def _worker_encode(texts, batch_size):
+    return _worker_model.encode(texts, batch_size=batch_size, convert_to_numpy=True, show_progress_bar=False)
+
+
+class EmbeddingService(Embeddings):
+    # One copy of the model per process (or per worker process), shared by every
+    # Streamlit session. Encoding is serialized because the HF fast tokenizer is
+    # not safe to call from several threads at once; batching keeps it fast.
+    def __init__(self, model_name=DEFAULT_MODEL_NAME, batch_size=BATCH_SIZE, num_threads=NUM_THREADS,
+                 use_worker_process=USE_WORKER_PROCESS):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.num_threads = num_threads
+        self.use_worker_process = use_worker_process
+        self._model = None
+        self._executor = None
+        self._load_lock = threading.Lock()
+        self._encode_lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        if self._model is not None or self._executor is not None:
+            return
+        with self._load_lock:
+            if self._model is not None or self._executor is not None:
+                return
+            if self.use_worker_process:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=1,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.model_name, self.num_threads),
+                )
+            else:
+                self._model = _load_model(self.model_name, self.num_threads)
+
+    def warm_up(self):
+        self.encode(["warm up"])
+
+    def encode(self, texts):
+        self._ensure_loaded()
+        texts = list(texts)
+        if self._executor is not None:
+            # Runs outside this interpreter, so the script thread keeps the GIL free
+            return self._executor.submit(_worker_encode, texts, self.batch_size).result()
+        with self._encode_lock:
+            return self._model.encode(texts, batch_size=self.batch_size, convert_to_numpy=True,
+                                      show_progress_bar=False)
+
+    def embed_documents(self, texts):
+        return self.encode(texts).tolist()
+
+    def embed_query(self, text):
+        return self.encode([text])[0].tolist()
+
+
+_services = {}
+_registry_lock = threading.Lock()
+
+
+def get_embedding_service(model_name=DEFAULT_MODEL_NAME):
+    with _registry_lock:
+        if model_name not in _services:
+            _services[model_name] = EmbeddingService(model_name)
+        return _services[model_name]
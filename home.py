@@ -1,6 +1,8 @@
+import os
 import streamlit as st
 from create_groups import show_create_groups  # Import the function from create_groups.py
-from quiz_generation import quiz_generation_app
+from clients import warm_up_embeddings_in_background
+from metrics_panel import show_metrics_panel
 
 
 def show_home():
@@ -10,6 +12,9 @@ def show_home():
 
     st.title("Home Page")
 
+    # Start loading the embedding model now that the user is signed in
+    warm_up_embeddings_in_background()
+
     # Sidebar for navigation
     st.sidebar.title("Navigation")
     # st.write(f"Token set: {st.session_state.token}")
@@ -17,16 +22,22 @@ def show_home():
     option = st.sidebar.selectbox("Select an option:",
                                   ["Generate Quiz", "Create Groups", "View Results", "Logout"])
 
+    # Optional admin panel with per-stage timings, token usage and cache hit rates
+    if os.getenv("ENABLE_ADMIN_PANEL") == "1" and st.sidebar.checkbox("Show performance metrics"):
+        show_metrics_panel()
+
     # Display content based on selected option
     if option == "Generate Quiz":
+        # Imported here so langchain, FAISS and the LLM clients load on first use
+        from quiz_generation import quiz_generation_app
         quiz_generation_app()
 
     elif option == "Create Groups":
         show_create_groups()
 
     elif option == "View Results":
-        st.subheader("View Quiz Results")
-        st.write("Here you can view the results of quizzes taken. (Functionality to be implemented.)")
+        from view_results import show_view_results
+        show_view_results()
 
     elif option == "Logout":
         st.session_state.clear()  # Clear session state
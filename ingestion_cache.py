@@ -0,0 +1,68 @@
+import hashlib
+import os
+
+from cache import LRUCache, DiskCache, default_cache_dir
+from telemetry import record_cache
+
+
+# Bump whenever stored chunks or their metadata change shape, so older entries
+# stop matching (2: chunks carry the page they start on)
+SCHEMA_VERSION = 2
+
+
+def ingestion_key(pdf_binary, chunk_size, chunk_overlap, model_name):
+    # Content-addressed: the same upload with the same chunker/embedding settings
+    # always maps to the same entry, no matter which session uploaded it.
+    digest = hashlib.sha256(pdf_binary)
+    digest.update(f"|{chunk_size}|{chunk_overlap}|{model_name}|v{SCHEMA_VERSION}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class IngestionCache:
+    # Memory tier keeps live objects (text, chunks, FAISS store, embeddings) so a
+    # rerun is a dictionary lookup. Disk tier keeps the serialized FAISS index so
+    # a restarted server does not have to re-embed documents it has already seen.
+    def __init__(self, directory, max_items=8, max_memory_bytes=512 * 1024 * 1024,
+                 max_disk_bytes=2 * 1024 * 1024 * 1024):
+        self.memory = LRUCache(max_items=max_items, max_bytes=max_memory_bytes)
+        self.disk = DiskCache(directory, max_bytes=max_disk_bytes)
+
+    def get(self, key, embeddings_factory):
+        entry = self.memory.get(key)
+        if entry is not None:
+            record_cache("ingestion", "memory_hit")
+            return entry
+
+        stored = self.disk.get(key)
+        if stored is None:
+            record_cache("ingestion", "miss")
+            return None
+        record_cache("ingestion", "disk_hit")
+
+        from langchain_community.vectorstores import FAISS
+
+        embeddings = embeddings_factory()
+        vector_store = FAISS.deserialize_from_bytes(
+            serialized=stored["faiss"],
+            embeddings=embeddings,
+            # Trusts the cache directory, which DiskCache keeps owner-only; entries
+            # may come from other processes or earlier runs of this app
+            allow_dangerous_deserialization=True,
+        )
+        entry = (stored["text"], stored["chunks"], vector_store, embeddings)
+        self.memory.put(key, entry, size=stored["size"])
+        return entry
+
+    def put(self, key, text, chunks, vector_store, embeddings):
+        serialized = vector_store.serialize_to_bytes()
+        size = len(text) + sum(len(chunk) for chunk in chunks) + len(serialized)
+        self.memory.put(key, (text, chunks, vector_store, embeddings), size=size)
+        self.disk.put(key, {"text": text, "chunks": chunks, "faiss": serialized, "size": size})
+
+
+ingestion_cache = IngestionCache(
+    default_cache_dir("ingestion"),
+    max_items=int(os.getenv("INGESTION_CACHE_ITEMS", "8")),
+    max_memory_bytes=int(os.getenv("INGESTION_CACHE_MEMORY_MB", "512")) * 1024 * 1024,
+    max_disk_bytes=int(os.getenv("INGESTION_CACHE_DISK_MB", "2048")) * 1024 * 1024,
+)
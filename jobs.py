@@ -0,0 +1,127 @@
+import os
+import time
+import uuid
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Jobs running at once across all sessions, and how many may wait behind them.
+# Beyond that new work is refused rather than queued with unbounded latency.
+MAX_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+MAX_QUEUED = int(os.getenv("JOB_QUEUE_LIMIT", "32"))
+# Finished jobs are kept this long so results survive reruns and reconnects
+RETENTION_SECONDS = int(os.getenv("JOB_RETENTION_SECONDS", "3600"))
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, kind):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "queued"  # queued, running, done, failed, cancelled
+        self.stage = "queued"
+        self.progress = 0.0
+        self.partial = []  # Results published before the job finishes (e.g. streamed questions)
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+        self._cancel = threading.Event()
+        self._future = None
+
+    @property
+    def active(self):
+        return self.status in ("queued", "running")
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def report(self, stage, progress=None):
+        # Called by the job function between steps; doubles as a cancellation point
+        self.check_cancelled()
+        self.stage = stage
+        if progress is not None:
+            self.progress = max(0.0, min(1.0, progress))
+
+
+class JobEngine:
+    def __init__(self, max_workers=MAX_WORKERS, max_queued=MAX_QUEUED):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="quiz-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind, fn, *args, **kwargs):
+        # fn(job, *args, **kwargs) runs on a worker thread; its return value becomes job.result
+        job = Job(kind)
+        with self._lock:
+            self._prune()
+            if self.queued() >= self.max_queued:
+                raise JobQueueFull(f"{self.queued()} jobs are already waiting; try again shortly.")
+            self._jobs[job.id] = job
+            job._future = self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job, fn, args, kwargs):
+        if job._cancel.is_set():
+            job.status = "cancelled"
+            job.finished = time.time()
+            return
+        job.status = "running"
+        try:
+            job.result = fn(job, *args, **kwargs)
+            job.status = "done"
+            job.progress = 1.0
+        except JobCancelled:
+            job.status = "cancelled"
+        except Exception as e:
+            job.error = str(e) or e.__class__.__name__
+            job.status = "failed"
+            traceback.print_exc()
+        finally:
+            job.finished = time.time()
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is None or not job.active:
+            return False
+        job._cancel.set()
+        if job._future is not None and job._future.cancel():
+            # Never started: settle it here since _run will not be called
+            job.status = "cancelled"
+            job.finished = time.time()
+        return True
+
+    def queued(self):
+        return sum(1 for job in self._jobs.values() if job.status == "queued")
+
+    def queue_position(self, job_id):
+        with self._lock:
+            waiting = sorted((job for job in self._jobs.values() if job.status == "queued"),
+                             key=lambda job: job.created)
+        for position, job in enumerate(waiting, start=1):
+            if job.id == job_id:
+                return position
+        return 0
+
+    def _prune(self):
+        cutoff = time.time() - RETENTION_SECONDS
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished and job.finished < cutoff]:
+            del self._jobs[job_id]
+
+
+job_engine = JobEngine()
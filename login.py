@@ -2,8 +2,7 @@
 import streamlit as st
 import requests
 import time
-# URL for your Express server (adjust as needed)
-BASE_URL = "http://localhost:3540"
+import backend_client
 
 def show_login():
     st.title("Login Page")
@@ -21,7 +20,7 @@ def show_login():
 
             try:
                 # Send POST request to the Express login route
-                response = requests.post(f"{BASE_URL}/t-login", json=payload)
+                response = backend_client.post("/t-login", json=payload, auth=False)
                 data = response.json()
 
                 # Check for success response from the server
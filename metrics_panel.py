@@ -0,0 +1,29 @@
+import streamlit as st
+
+from telemetry import metrics, cache_hit_rate
+
+
+CACHES = ["ingestion", "pdf_page", "completion"]
+
+
+def show_metrics_panel():
+    st.sidebar.subheader("Performance")
+
+    summary = metrics.stage_summary()
+    if summary:
+        st.sidebar.dataframe(summary, hide_index=True)
+    else:
+        st.sidebar.caption("No stages recorded yet.")
+
+    st.sidebar.markdown("**LLM tokens**")
+    for field in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        total = metrics.counter_total(f"llm_{field}_total")
+        st.sidebar.write(f"{field.replace('_', ' ').capitalize()}: {int(total)}")
+
+    st.sidebar.markdown("**Cache hit rates**")
+    for cache in CACHES:
+        rate = cache_hit_rate(cache)
+        st.sidebar.write(f"{cache}: {'n/a' if rate is None else f'{rate:.0%}'}")
+
+    with st.sidebar.expander("Recent spans"):
+        st.dataframe(list(reversed(metrics.recent)), hide_index=True)
@@ -0,0 +1,101 @@
+import io
+import os
+import hashlib
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from PyPDF2 import PdfReader
+
+from cache import LRUCache
+from telemetry import metrics
+
+
+PAGE_WORKERS = int(os.getenv("PDF_PAGE_WORKERS", str(os.cpu_count() or 1)))
+# Below this many uncached pages, spawning work for the pool costs more than it saves
+PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "32"))
+
+# Extracted page text keyed by "<document sha256>:<page index>"
+page_cache = LRUCache(max_items=50000, max_bytes=256 * 1024 * 1024)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=PAGE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+# In a pool worker: the reader for the document it last worked on
+_worker_document = {}
+
+
+def _extract_pages(pdf_path, page_indexes):
+    # Tasks carry a temp-file path rather than the PDF bytes, so a large
+    # document is not pickled into the pool once per slice
+    if _worker_document.get("path") != pdf_path:
+        with open(pdf_path, "rb") as f:
+            reader = PdfReader(io.BytesIO(f.read()))
+        _worker_document.clear()
+        _worker_document.update(path=pdf_path, reader=reader)
+    reader = _worker_document["reader"]
+    return {i: reader.pages[i].extract_text() or "" for i in page_indexes}
+
+
+def _split(items, parts):
+    size = max(1, -(-len(items) // parts))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def iter_pdf_pages(pdf_binary, parallel=None):
+    # Yields (page_number, text) in page order, page numbers starting at 1.
+    # In parallel mode every uncached page is submitted up front, so callers can
+    # chunk and embed early pages while later ones are still being parsed.
+    doc_hash = hashlib.sha256(pdf_binary).hexdigest()
+    reader = PdfReader(io.BytesIO(pdf_binary))
+    num_pages = len(reader.pages)
+
+    missing = [i for i in range(num_pages) if page_cache.get(f"{doc_hash}:{i}") is None]
+    if parallel is None:
+        parallel = PAGE_WORKERS > 1 and len(missing) >= PARALLEL_MIN_PAGES
+    metrics.inc("cache_requests_total", num_pages - len(missing), cache="pdf_page", result="hit")
+    metrics.inc("cache_requests_total", len(missing), cache="pdf_page", result="miss")
+
+    futures = {}
+    pdf_path = None
+    if parallel and missing:
+        pool = _get_pool()
+        fd, pdf_path = tempfile.mkstemp(prefix=f"pdf-{doc_hash[:16]}-", suffix=".pdf")
+        with os.fdopen(fd, "wb") as f:
+            f.write(pdf_binary)
+        # More slices than workers keeps the first pages coming back quickly
+        for page_indexes in _split(missing, PAGE_WORKERS * 2):
+            future = pool.submit(_extract_pages, pdf_path, page_indexes)
+            for i in page_indexes:
+                futures[i] = future
+
+    try:
+        for i in range(num_pages):
+            key = f"{doc_hash}:{i}"
+            text = page_cache.get(key)
+            if text is None:
+                if i in futures:
+                    for page_index, page_text in futures[i].result().items():
+                        page_cache.put(f"{doc_hash}:{page_index}", page_text, size=len(page_text))
+                    text = page_cache.get(key)
+                    if text is None:  # Evicted straight away by a tiny cache; fall back
+                        text = futures[i].result()[i]
+                else:
+                    text = reader.pages[i].extract_text() or ""
+                    page_cache.put(key, text, size=len(text))
+            yield i + 1, text
+    finally:
+        for future in set(futures.values()):
+            future.cancel()
+        if pdf_path is not None:
+            os.unlink(pdf_path)
@@ -0,0 +1,69 @@
+import json
+
+
+class QuestionStreamParser:
+    # Incrementally scans a streamed JSON array of question objects and returns
+    # each object as soon as its closing brace arrives. Text before the opening
+    # '[' is ignored, and an object that fails to parse is dropped on its own,
+    # so one bad character only costs one question.
+    def __init__(self):
+        self.questions = []
+        self._in_array = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._buffer = []
+
+    @property
+    def truncated(self):
+        # True when the stream ended part way through an object or before the closing ']'
+        return bool(self._buffer) or (self._in_array and not self._done)
+
+    def feed(self, text):
+        completed = []
+        for char in text:
+            if self._done:
+                break
+            if not self._in_array:
+                if char == '[':
+                    self._in_array = True
+                continue
+
+            if self._depth == 0:
+                if char == '{':
+                    self._depth = 1
+                    self._buffer = [char]
+                elif char == ']':
+                    self._done = True
+                continue
+
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    question = self._parse("".join(self._buffer))
+                    self._buffer = []
+                    if question is not None:
+                        self.questions.append(question)
+                        completed.append(question)
+        return completed
+
+    @staticmethod
+    def _parse(text):
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+        return value if isinstance(value, dict) else None
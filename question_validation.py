@@ -0,0 +1,120 @@
+import os
+from collections import Counter
+
+import numpy as np
+
+from quiz_scheduler import question_key
+from vector_index import normalize_rows
+
+
+MCQ_OPTIONS = 4
+BLANK = "____"
+# Cosine similarity between MiniLM embeddings above which two questions count as the same
+DUPLICATE_THRESHOLD = float(os.getenv("QUIZ_DUPLICATE_THRESHOLD", "0.9"))
+MAX_REPAIR_ROUNDS = int(os.getenv("QUIZ_MAX_REPAIR_ROUNDS", "2"))
+
+
+def _norm(text):
+    return " ".join(str(text).split()).lower()
+
+
+def check_question(question, question_type):
+    # Returns the reasons a question is unusable; empty means it passes
+    if not isinstance(question, dict):
+        return ["not a JSON object"]
+    problems = []
+    text = question.get("question")
+    answer = question.get("answer")
+    if not isinstance(text, str) or not text.strip():
+        problems.append("missing question text")
+    if answer is None or not str(answer).strip():
+        problems.append("missing answer")
+    if not str(question.get("topic") or "").strip():
+        problems.append("missing topic")
+
+    if question_type == "MCQ":
+        options = question.get("options")
+        if not isinstance(options, list) or len(options) != MCQ_OPTIONS:
+            problems.append(f"needs exactly {MCQ_OPTIONS} options")
+        else:
+            normalized = [_norm(option) for option in options]
+            if "" in normalized or len(set(normalized)) != len(normalized):
+                problems.append("options are not unique")
+            if answer is not None and _norm(answer) not in normalized:
+                problems.append("answer is not one of the options")
+    elif question_type == "Fill in the Blanks":
+        if isinstance(text, str) and BLANK not in text:
+            problems.append(f"no '{BLANK}' blank")
+    return problems
+
+
+def duplicate_flags(texts, encode=None, threshold=DUPLICATE_THRESHOLD):
+    # Marks every question that repeats an earlier one: exact matches after
+    # normalization, plus (given encode) paraphrases, found with one
+    # similarity matrix over the whole batch
+    seen = set()
+    flags = np.zeros(len(texts), dtype=bool)
+    for i, text in enumerate(texts):
+        key = question_key({"question": text})
+        flags[i] = key in seen
+        seen.add(key)
+    if encode is not None and len(texts) > 1:
+        x = normalize_rows(encode(texts))
+        similarity = np.triu(x @ x.T, k=1)
+        flags |= (similarity >= threshold).any(axis=0)
+    return flags
+
+
+def validate_questions(questions, question_type, encode=None, threshold=DUPLICATE_THRESHOLD):
+    # Returns (accepted, rejected) in order, rejected as {"question", "reasons"}.
+    # The first of a set of duplicates is the one kept.
+    accepted = []
+    rejected = []
+    for question in questions:
+        problems = check_question(question, question_type)
+        if problems:
+            rejected.append({"question": question, "reasons": problems})
+        else:
+            accepted.append(question)
+
+    flags = duplicate_flags([question["question"] for question in accepted], encode, threshold)
+    rejected.extend({"question": question, "reasons": ["duplicate of another question"]}
+                    for question, duplicate in zip(accepted, flags) if duplicate)
+    accepted = [question for question, duplicate in zip(accepted, flags) if not duplicate]
+    return accepted, rejected
+
+
+def validate_and_repair(questions, question_type, num_questions, regenerate, encode=None,
+                        threshold=DUPLICATE_THRESHOLD, max_rounds=MAX_REPAIR_ROUNDS, check_cancelled=None):
+    # Keeps every valid question and asks for replacements for the rest only.
+    # regenerate(n, rejected, accepted, round) returns up to n new question
+    # dicts. Replacements are checked together with the questions already
+    # accepted, so they cannot duplicate them.
+    # Returns (questions, rejected, warnings).
+    accepted, rejected = validate_questions(questions, question_type, encode, threshold)
+    all_rejected = list(rejected)
+    warnings = []
+
+    for round_number in range(max_rounds):
+        missing = num_questions - len(accepted)
+        if missing <= 0:
+            break
+        if check_cancelled is not None:
+            check_cancelled()
+        try:
+            replacements = regenerate(missing, rejected, accepted, round_number)
+        except Exception as e:
+            if check_cancelled is not None:
+                check_cancelled()
+            warnings.append(f"Could not regenerate rejected questions: {e}")
+            break
+        accepted, rejected = validate_questions(accepted + list(replacements), question_type, encode, threshold)
+        all_rejected.extend(rejected)
+
+    if all_rejected:
+        reasons = Counter(reason for item in all_rejected for reason in item["reasons"])
+        summary = ", ".join(f"{reason} ({count})" for reason, count in reasons.most_common())
+        warnings.insert(0, f"Rejected {len(all_rejected)} generated question(s): {summary}.")
+    if len(accepted) < num_questions:
+        warnings.append(f"Kept {len(accepted)} of {num_questions} questions after validation.")
+    return accepted[:num_questions], all_rejected, warnings
@@ -1,25 +1,44 @@
-import os
 import json
+import time
+import bisect
+import threading
 import requests
-from dotenv import load_dotenv
 import streamlit as st
-from PyPDF2 import PdfReader
+import backend_client
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.embeddings import SentenceTransformerEmbeddings
 from langchain_community.vectorstores import FAISS
-from groq import Groq
-from pinecone import Pinecone, ServerlessSpec
-import pinecone
 import uuid
-import base64
-
-
-load_dotenv()
-
-
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
-pdf_vectors_index = pinecone.Index("pdf_vectors", host=os.getenv("PINECONE_INDEX_HOST"))
+from ingestion_cache import ingestion_cache, ingestion_key
+from embedding_service import get_embedding_service, DEFAULT_MODEL_NAME
+from pdf_extraction import iter_pdf_pages
+from clients import get_groq_client, get_pinecone_index
+from quiz_scheduler import generate_quiz_batched, split_batches, QUIZ_BATCH_SIZE
+from question_stream import QuestionStreamParser
+from completion_cache import completion_cache
+from vector_index import upsert_in_background
+from document_upload import ensure_pdf_uploaded, pdf_content_hash
+from context_packer import context_budget, count_tokens, pack_chunks, truncate_to_tokens, MIN_CONTEXT_TOKENS
+from chunk_coverage import coverage_order
+from telemetry import span, record_token_usage
+from jobs import job_engine, JobCancelled, JobQueueFull
+from document_set import DocumentSet
+from retest_pools import build_retest_pools, rank_chunks_for_topics
+from question_validation import check_question, validate_and_repair
+
+
+CHUNK_SIZE = 10000
+CHUNK_OVERLAP = 1000
+EMBEDDING_MODEL_NAME = DEFAULT_MODEL_NAME
+# How much streamed text to buffer before splitting, and how many chunks to embed at once
+STREAM_SPLIT_CHARS = CHUNK_SIZE * 4
+EMBED_BATCH_CHUNKS = 8
+QUIZ_MODEL = "llama3-8b-8192"
+# How often the page refreshes while a background job is running
+JOB_POLL_SECONDS = 0.5
+# How many ranked chunks to offer the context packer
+CONTEXT_CANDIDATES = 8
+# Rejected questions quoted back to the model when asking for replacements
+REPAIR_EXAMPLES = 10
 
 
 user_id_val = []
@@ -28,25 +47,64 @@ def generate_unique_document_id():
 
 
 
+@span("get_pdf_text")
 def get_pdf_text(pdf_file):
-    text = ""
-    pdf_reader = PdfReader(pdf_file)
-    for page in pdf_reader.pages:
-        page_text = page.extract_text()
-        if page_text:
-            text += page_text
-    return text
+    pdf_binary = pdf_file if isinstance(pdf_file, bytes) else pdf_file.read()
+    return "".join(page_text for _, page_text in iter_pdf_pages(pdf_binary))
 
 
 
+@span("get_text_chunks")
 def get_text_chunks(text):
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=10000, chunk_overlap=1000)
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
     chunks = text_splitter.split_text(text)
     return chunks
 
 
-
-def generate_quiz_questions(context, difficulty, question_type, num_questions):
+def iter_page_chunks(pages):
+    # Chunks a stream of (page_number, text) pairs without waiting for the whole
+    # document, yielding (chunk, page_number) with the page each chunk starts on. The last chunk of each split is carried over
+    # so chunk boundaries (and overlap) are still chosen by the splitter rather
+    # than by page breaks.
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+    buffer = ""
+    offsets = []  # Where each page starts in buffer, ascending
+    page_numbers = []
+
+    def locate(chunks):
+        located = []
+        cursor = 0
+        for chunk in chunks:
+            offset = buffer.find(chunk, cursor)
+            if offset < 0:
+                offset = cursor
+            page = page_numbers[max(0, bisect.bisect_right(offsets, offset) - 1)]
+            located.append((chunk, offset, page))
+            cursor = offset + 1
+        return located
+
+    for page_number, text in pages:
+        offsets.append(len(buffer))
+        page_numbers.append(page_number)
+        buffer += text
+        if len(buffer) >= STREAM_SPLIT_CHARS:
+            located = locate(text_splitter.split_text(buffer))
+            for chunk, _, page in located[:-1]:
+                yield chunk, page
+            if not located:
+                buffer, offsets, page_numbers = "", [], []
+                continue
+            carry = located[-1][1]
+            keep = bisect.bisect_right(offsets, carry) - 1
+            buffer = buffer[carry:]
+            offsets = [0] + [offset - carry for offset in offsets[keep + 1:]]
+            page_numbers = page_numbers[keep:]
+    if buffer:
+        for chunk, _, page in locate(text_splitter.split_text(buffer)):
+            yield chunk, page
+
+
+def build_quiz_prompt(context, difficulty, question_type, num_questions):
     difficulty_prompt = {
         "Easy": "Generate simple and straightforward questions that test basic knowledge. These questions should be designed for beginners and require minimal critical thinking, focusing on foundational concepts and definitions. Ideal for learners who are just starting to explore the topic.",
 
@@ -84,40 +142,238 @@ def generate_quiz_questions(context, difficulty, question_type, num_questions):
                 """
     }
 
-    query = f"Context: {context}\n\nGenerate {num_questions} {question_type} questions based on this context. {difficulty_prompt[difficulty]} {question_type_prompt[question_type]}"
+    return f"Context: {context}\n\nGenerate {num_questions} {question_type} questions based on this context. {difficulty_prompt[difficulty]} {question_type_prompt[question_type]}"
+
 
-    chat_completion = client.chat.completions.create(
-        messages=[
-            {
-                "role": "user",
-                "content": query,
-            }
-        ],
-        model="llama3-8b-8192",
-    )
+def generate_quiz_questions(context, difficulty, question_type, num_questions, force_regenerate=False):
+    query = build_quiz_prompt(context, difficulty, question_type, num_questions)
+    return complete_quiz_prompt(query, force_regenerate)
 
-    return chat_completion.choices[0].message.content
 
+def complete_quiz_prompt(query, force_regenerate=False):
+    if not force_regenerate:
+        cached = completion_cache.get(query, QUIZ_MODEL)
+        if cached is not None:
+            return cached
 
+    with span("llm_call", model=QUIZ_MODEL):
+        chat_completion = get_groq_client().chat.completions.create(
+            messages=[
+                {
+                    "role": "user",
+                    "content": query,
+                }
+            ],
+            model=QUIZ_MODEL,
+        )
+    record_token_usage(chat_completion.usage, QUIZ_MODEL)
 
+    content = chat_completion.choices[0].message.content
+    if _is_parseable(content):
+        completion_cache.put(query, QUIZ_MODEL, content)
+    return content
+
+
+def stream_quiz_questions(context, difficulty, question_type, num_questions, parser=None, force_regenerate=False):
+    # Yields each question as soon as the model has finished writing it. Pass a
+    # parser to check parser.truncated once the generator is exhausted.
+    query = build_quiz_prompt(context, difficulty, question_type, num_questions)
+    parser = parser or QuestionStreamParser()
+
+    if not force_regenerate:
+        cached = completion_cache.get(query, QUIZ_MODEL)
+        if cached is not None:
+            yield from parser.feed(cached)
+            return
+
+    content = []
+    with span("llm_stream", model=QUIZ_MODEL):
+        stream = get_groq_client().chat.completions.create(
+            messages=[
+                {
+                    "role": "user",
+                    "content": query,
+                }
+            ],
+            model=QUIZ_MODEL,
+            stream=True,
+        )
+
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                content.append(delta)
+                yield from parser.feed(delta)
+            # Groq reports usage on the final chunk of a stream
+            x_groq = getattr(chunk, "x_groq", None)
+            if x_groq is not None and getattr(x_groq, "usage", None) is not None:
+                record_token_usage(x_groq.usage, QUIZ_MODEL)
+
+    # Only complete responses are worth replaying
+    if parser.questions and not parser.truncated:
+        completion_cache.put(query, QUIZ_MODEL, "".join(content))
+
+
+@span("parse_quiz_response")
+def parse_quiz_response(response):
+    start_index = response.find('[')
+    end_index = response.rfind(']')
+    json_string = response[start_index:end_index + 1]
+    return json.loads(json_string)
+
+
+def _is_parseable(response):
+    # Only responses holding at least one question object are worth caching
+    try:
+        questions = parse_quiz_response(response)
+    except ValueError:
+        return False
+    return isinstance(questions, list) and bool(questions) and all(isinstance(q, dict) for q in questions)
+
+
+def build_repair_notes(rejected, accepted):
+    # Appended to the usual prompt when asking for replacements
+    notes = ["\n\nSome earlier questions were rejected. Avoid these problems:"]
+    notes += [f"- {json.dumps(item['question'])}: {'; '.join(item['reasons'])}" for item in rejected[-REPAIR_EXAMPLES:]]
+    if accepted:
+        notes.append("Do not repeat or paraphrase any of these existing questions:")
+        notes += [f"- {question['question']}" for question in accepted]
+    return "\n".join(notes)
+
+
+def repair_quiz_questions(context, difficulty, question_type, num_questions, rejected, accepted,
+                          force_regenerate=False):
+    # Asks for num_questions replacements only, leaving room in the window for the notes
+    notes = build_repair_notes(rejected, accepted)
+    budget = quiz_context_budget(difficulty, question_type, num_questions) - count_tokens(notes)
+    budget = max(MIN_CONTEXT_TOKENS, budget)
+    query = build_quiz_prompt(truncate_to_tokens(context, budget), difficulty, question_type, num_questions) + notes
+    with span("repair_questions"):
+        questions = parse_quiz_response(complete_quiz_prompt(query, force_regenerate))
+    return questions if isinstance(questions, list) else []
+
+
+def generate_quiz_batch(context, difficulty, question_type, num_questions, force_regenerate=False):
+    response = generate_quiz_questions(context, difficulty, question_type, num_questions, force_regenerate)
+    questions = parse_quiz_response(response)
+    if not isinstance(questions, list) or not questions:
+        raise ValueError("Model returned no questions")
+    return questions[:num_questions]
+
+
+def select_batch_contexts(query, vector_store, text_chunks, num_batches, whole_document=True):
+    # One chunk per batch: the top matches for the query, or without a query
+    # representative chunks from clusters across the whole document
+    if query:
+        docs = vector_store.similarity_search(query, k=num_batches)
+        return [doc.page_content for doc in docs]
+    if whole_document:
+        return [text_chunks[i] for i in coverage_order(vector_store, num_batches)]
+    step = len(text_chunks) / num_batches
+    return [text_chunks[min(int(i * step), len(text_chunks) - 1)] for i in range(num_batches)]
+
+
+
+@span("create_vector_store")
 def create_vector_store(chunks):
-    embeddings = SentenceTransformerEmbeddings(model_name="paraphrase-MiniLM-L6-v2")
+    embeddings = get_embedding_service(EMBEDDING_MODEL_NAME)
     vector_store = FAISS.from_texts(chunks, embeddings)
     return vector_store, chunks, embeddings
 
-def fetch_relevant_documents(query, vector_store, num_chunks=3):
+
+@span("create_vector_store")
+def create_vector_store_incremental(chunk_iter):
+    # Embeds (chunk, metadata) pairs in small batches as they arrive and grows one FAISS index
+    embeddings = get_embedding_service(EMBEDDING_MODEL_NAME)
+    vector_store = None
+    chunks = []
+    batch = []
+    metadatas = []
+
+    def flush():
+        nonlocal vector_store
+        if vector_store is None:
+            vector_store = FAISS.from_texts(batch, embeddings, metadatas=metadatas)
+        else:
+            vector_store.add_texts(batch, metadatas=metadatas)
+        chunks.extend(batch)
+        batch.clear()
+        metadatas.clear()
+
+    for chunk, metadata in chunk_iter:
+        batch.append(chunk)
+        metadatas.append(metadata)
+        if len(batch) >= EMBED_BATCH_CHUNKS:
+            flush()
+    if batch:
+        flush()
+    return vector_store, chunks, embeddings
+
+
+@span("ingest_pdf")
+def ingest_pdf(pdf_binary, on_page=None):
+    # Parse, chunk and embed an upload once per document; reruns hit the cache.
+    # Each chunk records the page it starts on in its metadata.
+    key = ingestion_key(pdf_binary, CHUNK_SIZE, CHUNK_OVERLAP, EMBEDDING_MODEL_NAME)
+    cached = ingestion_cache.get(key, lambda: get_embedding_service(EMBEDDING_MODEL_NAME))
+    if cached is not None:
+        return cached
+
+    page_texts = []
+
+    def stream_pages():
+        for page_number, page_text in iter_pdf_pages(pdf_binary):
+            if on_page is not None:
+                on_page(page_number)
+            page_texts.append(page_text)
+            yield page_number, page_text
+
+    chunk_iter = ((chunk, {"page": page}) for chunk, page in iter_page_chunks(stream_pages()))
+    vector_store, texts, embeddings = create_vector_store_incremental(chunk_iter)
+    pdf_text = "".join(page_texts)
+    if vector_store is None:
+        return pdf_text, [], None, None
+
+    ingestion_cache.put(key, pdf_text, texts, vector_store, embeddings)
+    return pdf_text, texts, vector_store, embeddings
+
+@span("fetch_relevant_documents")
+def fetch_relevant_documents(query, vector_store, num_chunks=3, token_budget=None, compress=False):
     docs = vector_store.similarity_search(query, k=num_chunks)
-    return " ".join([doc.page_content for doc in docs])
+    chunks = [doc.page_content for doc in docs]
+    if token_budget is None:
+        return " ".join(chunks)
+    return pack_chunks(chunks, token_budget, compress)[0]
+
+
+def quiz_context_budget(difficulty, question_type, num_questions):
+    overhead = count_tokens(build_quiz_prompt("", difficulty, question_type, num_questions))
+    return context_budget(overhead, num_questions, question_type)
+
+
+@span("context_assembly")
+def assemble_context(query, vector_store, text_chunks, difficulty, question_type, num_questions, compress=False,
+                     whole_document=True):
+    # Candidates in priority order; the packer decides how many fit
+    budget = quiz_context_budget(difficulty, question_type, num_questions)
+    if query:
+        context = fetch_relevant_documents(query, vector_store, CONTEXT_CANDIDATES, budget, compress)
+    elif whole_document:
+        candidates = [text_chunks[i] for i in coverage_order(vector_store, CONTEXT_CANDIDATES)]
+        context = pack_chunks(candidates, budget, compress)[0]
+    else:
+        context = pack_chunks(text_chunks[:CONTEXT_CANDIDATES], budget, compress)[0]
+    return context, budget
 
 
 
 def fetch_groups():
-    token = st.session_state.get('token')
-    headers = {}
-    if token:
-        headers['Authorization'] = f'Bearer {token}'
+    try:
+        response = backend_client.post("/find_groups")
+    except requests.exceptions.RequestException as e:
+        st.error(f"Error connecting to server: {e}")
+        return None, []
 
-    response = requests.post("http://localhost:3540/find_groups", headers=headers)
     if response.status_code == 200:
         data = response.json()
         user_id = data.get('mailId', None)
@@ -129,8 +385,15 @@ def fetch_groups():
     return None, []
 
 
+@span("assign_tests")
 def assign_tests(token, group_name, questions,quiz_name,is_retest_needed,max_retests,min_marks_for_retest,total_marks,marks_for_each_qn,vector_store,texts,user_id,document_id,embeddings,pdf_binary):
-    pdf_base64 = base64.b64encode(pdf_binary).decode('utf-8')
+    # pdf_binary is one PDF or a list of them when the quiz covers several files
+    pdf_binaries = [pdf_binary] if isinstance(pdf_binary, bytes) else list(pdf_binary)
+    try:
+        pdf_hashes = [ensure_pdf_uploaded(binary, token) for binary in pdf_binaries]
+    except (requests.exceptions.RequestException, ValueError) as e:
+        return False, f"Failed to upload learning material: {e}"
+
     payload = {
         "group": group_name,
         "questions": questions,
@@ -140,19 +403,302 @@ def assign_tests(token, group_name, questions,quiz_name,is_retest_needed,max_ret
         "min_marks_for_retest":min_marks_for_retest,
         "total_marks":total_marks,
         "marks_for_each_qn":marks_for_each_qn,
-        "pdf_binary":pdf_base64,
+        "pdf_hash":pdf_hashes[0],
+        "pdf_hashes":pdf_hashes,
         "document_id":document_id,
     }
-    print("payload: ",payload)
-    headers = {
-        "Authorization": f"Bearer {token}"
+    print("payload: ", backend_client.preview_for_log(payload))
+
+    try:
+        response = backend_client.post("/assign_tests", json=payload, token=token)
+    except requests.exceptions.RequestException as e:
+        return False, f"Error connecting to server: {e}"
+
+    if response.status_code == 200 and vector_store is not None:
+        # Persist the chunk vectors under the document's namespace without blocking the page
+        try:
+            upsert_in_background(get_pinecone_index(), vector_store, document_id, user_id)
+        except Exception as e:
+            print(f"Could not start vector upsert for document {document_id}: {e}")
+    return response.status_code == 200, response.text
+
+
+def run_ingestion_job(job, pdf_binary):
+    job.report("Reading the PDF", 0.05)
+    result = ingest_pdf(pdf_binary, on_page=lambda page: job.report(f"Read page {page}"))
+    job.report("Done", 1.0)
+    return result
+
+
+def run_generation_job(job, vector_store, text_chunks, query, difficulty, question_type, num_questions,
+                       force_regenerate=False, compress_context=False, whole_document=True, stream=True):
+    # Runs on a job worker thread: reports progress through job and returns
+    # {"questions", "warnings", "prompt_tokens", "budget", "settings"} instead of
+    # touching st.*; settings records what the quiz was generated with
+    warnings = []
+    prompt_tokens = None
+
+    job.report("Selecting context", 0.05)
+    if num_questions > QUIZ_BATCH_SIZE:
+        # Large quizzes are split into concurrent batches, each on its own chunk
+        batch_sizes = split_batches(num_questions)
+        budget = quiz_context_budget(difficulty, question_type, max(batch_sizes))
+        with span("context_assembly"):
+            contexts = [
+                pack_chunks([chunk], budget, compress_context)[0]
+                for chunk in select_batch_contexts(query, vector_store, text_chunks, len(batch_sizes),
+                                                   whole_document)
+            ]
+
+        completed = []
+        prompts_sent = set()
+        lock = threading.Lock()
+
+        def generate_batch(context, n):
+            job.check_cancelled()
+            # Retries and short documents reuse contexts; a repeated prompt would
+            # get the earlier batch's cached response, all of it duplicates
+            with lock:
+                repeated = (context, n) in prompts_sent
+                prompts_sent.add((context, n))
+            questions = generate_quiz_batch(context, difficulty, question_type, n, force_regenerate or repeated)
+            with lock:
+                completed.append(n)
+                job.report(f"Generated {len(completed)} of {len(batch_sizes)} batches",
+                           0.1 + 0.9 * len(completed) / len(batch_sizes))
+            return questions
+
+        job.report(f"Generating {len(batch_sizes)} batches", 0.1)
+        with span("generate_quiz_batched"):
+            questions, failed_batches = generate_quiz_batched(contexts, num_questions, generate_batch)
+        job.check_cancelled()
+        if failed_batches:
+            warnings.append(f"{len(failed_batches)} batch(es) failed after retries; "
+                            f"generated {len(questions)} of {num_questions} questions.")
+    else:
+        context, budget = assemble_context(query, vector_store, text_chunks, difficulty, question_type,
+                                           num_questions, compress_context, whole_document)
+        prompt_tokens = count_tokens(build_quiz_prompt(context, difficulty, question_type, num_questions))
+
+        job.report("Generating questions", 0.1)
+        questions = []
+        if stream:
+            parser = QuestionStreamParser()
+            try:
+                for question in stream_quiz_questions(context, difficulty, question_type, num_questions, parser,
+                                                      force_regenerate):
+                    questions.append(question)
+                    job.partial.append(question)
+                    job.report("Generating questions", 0.1 + 0.9 * min(1.0, len(questions) / num_questions))
+            except JobCancelled:
+                raise
+            except Exception as e:
+                warnings.append(f"Generation stopped early: {e}")
+            if parser.truncated:
+                warnings.append(f"The response was cut off; kept {len(questions)} complete questions.")
+        else:
+            # Wait for the whole response and parse it in one go
+            try:
+                parsed = parse_quiz_response(generate_quiz_questions(context, difficulty, question_type,
+                                                                     num_questions, force_regenerate))
+                questions = parsed if isinstance(parsed, list) else []
+            except ValueError as e:
+                warnings.append(f"Could not parse the model's response: {e}")
+        contexts = [context]
+
+    job.report("Validating questions", 0.95)
+
+    def regenerate(n, rejected, accepted, round_number):
+        job.report(f"Replacing {n} rejected question(s)")
+
+        def repair_batch(context, size):
+            job.check_cancelled()
+            return repair_quiz_questions(context, difficulty, question_type, size, rejected, accepted,
+                                         force_regenerate)
+
+        shift = round_number % len(contexts)
+        if n <= QUIZ_BATCH_SIZE:
+            return repair_batch(contexts[shift], n)
+        # Many replacements are split like any large quiz so no single response gets truncated
+        replacements, _ = generate_quiz_batched(contexts[shift:] + contexts[:shift], n, repair_batch)
+        return replacements
+
+    with span("validate_questions"):
+        questions, _, validation_warnings = validate_and_repair(
+            questions, question_type, num_questions, regenerate,
+            encode=get_embedding_service(EMBEDDING_MODEL_NAME).encode, check_cancelled=job.check_cancelled)
+    warnings.extend(validation_warnings)
+
+    if not questions:
+        raise ValueError("Failed to generate quiz questions.")
+    settings = {"difficulty": difficulty, "question_type": question_type, "compress_context": compress_context}
+    return {"questions": questions, "warnings": warnings, "prompt_tokens": prompt_tokens, "budget": budget,
+            "settings": settings}
+
+
+def run_assignment_job(job, *args):
+    job.report("Uploading learning material and assigning the quiz", 0.2)
+    return assign_tests(*args)
+
+
+def store_retest_pools(token, quiz_id, pools):
+    # The backend keeps the pools with the quiz and hands one out per retest
+    response = backend_client.post("/retest_pools", json={"quiz_id": quiz_id, "pools": pools}, token=token)
+    response.raise_for_status()
+
+
+def run_retest_pool_job(job, token, quiz_id, questions, vector_store, embeddings, difficulty, question_type,
+                        num_pools, compress_context=False):
+    # Prepares every retest for a quiz up front, so a failed attempt is served
+    # from stored questions instead of waiting on the LLM
+    job.report("Finding material for each topic", 0.05)
+    topics = sorted({question.get("topic") or "General" for question in questions})
+    budget = quiz_context_budget(difficulty, question_type, QUIZ_BATCH_SIZE)
+    topic_contexts = {
+        topic: [pack_chunks([chunk], budget, compress_context)[0] for chunk in chunks]
+        for topic, chunks in rank_chunks_for_topics(vector_store, embeddings, topics).items()
     }
 
-    response = requests.post("http://localhost:3540/assign_tests", json=payload, headers=headers)
-    return response.status_code == 200, response.text
+    def generate_batch(context, n):
+        job.check_cancelled()
+        # Bypass the completion cache: contexts repeat across batches and with the
+        # original quiz, and a cached answer would only yield duplicates
+        questions = generate_quiz_batch(context, difficulty, question_type, n, force_regenerate=True)
+        return [question for question in questions if not check_question(question, question_type)]
+
+    job.report(f"Generating {num_pools} retest pool(s)", 0.1)
+    with span("retest_pools"):
+        pools, warnings = build_retest_pools(questions, num_pools, topic_contexts, generate_batch,
+                                             check_cancelled=job.check_cancelled)
+    job.report("Saving retest pools", 0.9)
+    store_retest_pools(token, quiz_id, pools)
+    return {"pools": pools, "warnings": warnings}
+
+
+def show_job_status(job_id, label):
+    # Renders progress (with a cancel button) or the outcome of one job; returns the job
+    job = job_engine.get(job_id) if job_id else None
+    if job is None:
+        return None
+    if job.status == "queued":
+        st.progress(0.0, text=f"{label}: waiting for a worker (position {job_engine.queue_position(job.id)})")
+    elif job.status == "running":
+        st.progress(job.progress, text=f"{label}: {job.stage}")
+    elif job.status == "failed":
+        st.error(f"{label} failed: {job.error}")
+    elif job.status == "cancelled":
+        st.warning(f"{label} was cancelled.")
+
+    if job.active and st.button("Cancel", key=f"cancel_{job.id}"):
+        job_engine.cancel(job.id)
+    return job
+
+
+def submit_job(session_key, kind, fn, *args, **kwargs):
+    try:
+        job = job_engine.submit(kind, fn, *args, **kwargs)
+    except JobQueueFull as e:
+        st.error(f"The server is busy: {e}")
+        return None
+    st.session_state[session_key] = job.id
+    return job
+
+
+def _job_active(job_id):
+    job = job_engine.get(job_id) if job_id else None
+    return job is not None and job.active
+
+
+def session_jobs_active():
+    if any(_job_active(job_id) for job_id in st.session_state.get('ingest_jobs', {}).values()):
+        return True
+    return any(_job_active(st.session_state.get(session_key))
+               for session_key in ('generate_job', 'assign_job', 'retest_job'))
+
+
+def uploaded_file_hash(uploaded_file):
+    # Hashed once per upload rather than on every rerun while jobs are polled
+    hashes = st.session_state.setdefault('upload_hashes', {})
+    if uploaded_file.file_id not in hashes:
+        hashes[uploaded_file.file_id] = pdf_content_hash(uploaded_file.getvalue())
+    return hashes[uploaded_file.file_id]
+
+
+def load_learning_materials(uploaded_files):
+    # Every new file is ingested by its own background job, so several PDFs are
+    # parsed in parallel. Finished files are folded into the session's
+    # DocumentSet and files taken off the uploader are removed from it. Returns
+    # the combined (text, chunks, vector_store, embeddings), or None while files
+    # are still being processed.
+    documents = st.session_state.setdefault('document_set', DocumentSet())
+    ingest_jobs = st.session_state.setdefault('ingest_jobs', {})
+    file_ids = {uploaded_file.file_id for uploaded_file in uploaded_files}
+    st.session_state['upload_hashes'] = {file_id: file_hash for file_id, file_hash
+                                         in st.session_state.get('upload_hashes', {}).items() if file_id in file_ids}
+    uploads = {}
+    for uploaded_file in uploaded_files:
+        uploads.setdefault(uploaded_file_hash(uploaded_file), uploaded_file)
+
+    # Generation and assignment read the combined index, so it only changes between jobs
+    busy = any(_job_active(st.session_state.get(session_key))
+               for session_key in ('generate_job', 'assign_job', 'retest_job'))
+
+    for file_hash in [file_hash for file_hash in ingest_jobs if file_hash not in uploads]:
+        job_engine.cancel(ingest_jobs.pop(file_hash))
+    changed = False
+    if not busy:
+        for file_hash in [file_hash for file_hash in documents.files if file_hash not in uploads]:
+            documents.remove(file_hash)
+            changed = True
+
+    pending = False
+    for file_hash, uploaded_file in uploads.items():
+        if file_hash in documents:
+            continue
+        job = job_engine.get(ingest_jobs.get(file_hash)) if ingest_jobs.get(file_hash) else None
+        if job is None:
+            try:
+                job = job_engine.submit("ingest", run_ingestion_job, uploaded_file.getvalue())
+            except JobQueueFull as e:
+                st.error(f"The server is busy: {e}")
+                return None
+            ingest_jobs[file_hash] = job.id
+
+        job = show_job_status(job.id, f"Processing {uploaded_file.name}")
+        if job.status == "done" and not busy:
+            documents.add(file_hash, uploaded_file.name, job.result)
+            del ingest_jobs[file_hash]
+            changed = True
+            continue
+        pending = True
+        if job.status in ("failed", "cancelled") and st.button("Process again", key=f"reprocess_{file_hash}"):
+            ingest_jobs.pop(file_hash, None)
+            st.rerun()
+
+    if changed:
+        # The quiz on screen was generated from the previous set of files
+        st.session_state.pop('combined_material', None)
+    if busy and (pending or len(documents.files) != len(uploads)):
+        st.info("Changes to the uploaded files will apply once the current job finishes.")
+    elif pending:
+        return None
+    if not documents.files:
+        return None
+    if 'combined_material' not in st.session_state:
+        st.session_state['combined_material'] = documents.as_ingested()
+    return st.session_state['combined_material']
 
 
 def quiz_generation_app():
+    show_quiz_generation()
+
+    # Keep the page refreshing while this session has work in flight
+    if session_jobs_active():
+        time.sleep(JOB_POLL_SECONDS)
+        st.rerun()
+
+
+def show_quiz_generation():
     st.title("AI-Powered Quiz Generation")
 
     # Ensure session state variables are initialized
@@ -184,47 +730,62 @@ def quiz_generation_app():
     if is_retest_needed:
         max_retests = st.number_input("Max Retests Allowed", min_value=1, step=1)
 
-    uploaded_file = st.file_uploader("Upload learning material (PDF)", type=["pdf"])
-    if uploaded_file is not None:
-        pdf_binary = uploaded_file.read()
-        pdf_text = get_pdf_text(uploaded_file)
+    uploaded_files = st.file_uploader("Upload learning material (PDF)", type=["pdf"], accept_multiple_files=True)
+    if uploaded_files:
+        ingested = load_learning_materials(uploaded_files)
+        if ingested is None:
+            return
+        pdf_text, text_chunks, vector_store, embeddings = ingested
+        texts = text_chunks
         if pdf_text:
             st.write("Learning material uploaded successfully.")
+            if len(uploaded_files) > 1:
+                st.caption(f"{len(st.session_state['document_set'].files)} files, {len(text_chunks)} chunks "
+                           "in one combined index.")
 
 
             query = st.text_input("Enter a query to fetch relevant content (optional)")
 
 
-            text_chunks = get_text_chunks(pdf_text)
-            vector_store, texts,embeddings = create_vector_store(text_chunks)
-
-
             difficulty = st.selectbox("Select quiz difficulty", ["Easy", "Medium", "Hard"])
             question_type = st.selectbox("Select question type", ["MCQ", "Fill in the Blanks"])
             num_questions = st.number_input("Number of questions", min_value=1, step=1)
+            stream_output = st.checkbox("Show questions as they are generated", value=True)
+            force_regenerate = st.checkbox("Force regenerate (ignore cached results)")
+            compress_context = st.checkbox("Compress context (strip headers, footers and page numbers)")
+            whole_document = st.checkbox("Cover the whole document when no query is given", value=True)
 
             if st.button("Generate Quiz"):
-                st.write("Generating quiz...")
-
-
-                context = fetch_relevant_documents(query, vector_store) if query else " ".join(text_chunks[:3])
-
-
-                response = generate_quiz_questions(context, difficulty, question_type, num_questions)
-
-
-                start_index = response.find('[')
-                end_index = response.rfind(']')
-                json_string = response[start_index:end_index + 1]
-
-
-                st.session_state['questions'] = json.loads(json_string)
+                job = submit_job('generate_job', "generate", run_generation_job, vector_store, text_chunks, query,
+                                 difficulty, question_type, num_questions, force_regenerate, compress_context,
+                                 whole_document, stream_output)
+                if job is not None:
+                    st.session_state['quiz_generated'] = False
+                    st.session_state['questions'] = None
+
+            job = show_job_status(st.session_state.get('generate_job'), "Generating quiz")
+            if job is not None and job.active and stream_output:
+                for question in list(job.partial):
+                    st.write(question)
+            if job is not None and job.status == "done" and st.session_state.get('generated_from') != job.id:
+                # Copy the finished job's output into the session exactly once
+                st.session_state['questions'] = job.result['questions']
+                st.session_state['generation_info'] = job.result
                 st.session_state['quiz_generated'] = True
+                st.session_state['generated_from'] = job.id
 
+            if st.session_state['quiz_generated']:
+                info = st.session_state.get('generation_info', {})
+                for warning in info.get('warnings', []):
+                    st.warning(warning)
+                if info.get('prompt_tokens'):
+                    st.caption(f"Prompt size: {info['prompt_tokens']} tokens (context budget {info['budget']})")
 
                 st.session_state['total_marks'] = marks_for_each_qn * len(st.session_state['questions'])
                 st.write(st.session_state['questions'])
                 st.write(f"Total Marks: {st.session_state['total_marks']}")
+                cache_stats = completion_cache.stats()
+                st.caption(f"Completion cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
 
                 if is_retest_needed:
                     min_marks_for_retest = st.number_input("Minimum marks required for retest", min_value=1,
@@ -235,7 +796,6 @@ def quiz_generation_app():
 
             if st.session_state['quiz_generated']:
                 if st.button("Assign Quiz"):
-                    st.write("Assign Quiz button clicked.")
                     token = st.session_state.get('token')
                     document_id = generate_unique_document_id()
                     user_id = st.session_state['user_id']
@@ -245,7 +805,10 @@ def quiz_generation_app():
                         return
 
 
-                    success, message = assign_tests(
+                    submit_job(
+                        'assign_job',
+                        "assign",
+                        run_assignment_job,
                         token,
                         selected_group,
                         st.session_state['questions'],
@@ -260,17 +823,35 @@ def quiz_generation_app():
                         user_id,
                         document_id,
                         embeddings,
-                        pdf_binary
+                        [uploaded_file.getvalue() for uploaded_file in uploaded_files]
 
                     )
 
-
+                job = show_job_status(st.session_state.get('assign_job'), "Assigning quiz")
+                if job is not None and job.status == "done":
+                    success, message = job.result
                     if success:
                         if 'quiz_id' in message:
                             message_json = json.loads(message)
                             st.success("Quiz assigned successfully!")
                             st.write(f"Quiz ID: {message_json['quiz_id']}")
+                            if is_retest_needed and st.session_state.get('retest_for') != job.id:
+                                # Pre-generate the retests now, once per assignment, with the
+                                # settings the quiz was generated with rather than the current widgets
+                                st.session_state['retest_for'] = job.id
+                                settings = st.session_state['generation_info']['settings']
+                                submit_job('retest_job', "retest_pools", run_retest_pool_job,
+                                           st.session_state.get('token'), message_json['quiz_id'],
+                                           st.session_state['questions'], vector_store, embeddings,
+                                           settings['difficulty'], settings['question_type'], max_retests,
+                                           settings['compress_context'])
                         else:
                             st.error("Unexpected response structure.")
                     else:
                         st.error(f"Failed to assign quiz: {message}")
+
+                job = show_job_status(st.session_state.get('retest_job'), "Preparing retest questions")
+                if job is not None and job.status == "done":
+                    for warning in job.result['warnings']:
+                        st.warning(warning)
+                    st.success(f"{len(job.result['pools'])} retest pool(s) ready.")
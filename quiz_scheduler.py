@@ -0,0 +1,65 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+# Questions per LLM call, and how many calls one generation may have open at once
+QUIZ_BATCH_SIZE = int(os.getenv("QUIZ_BATCH_SIZE", "10"))
+MAX_IN_FLIGHT = int(os.getenv("QUIZ_MAX_IN_FLIGHT", "4"))
+MAX_BATCH_ATTEMPTS = 3
+
+
+def split_batches(num_questions, batch_size=QUIZ_BATCH_SIZE):
+    # Even sizes (25 -> [9, 8, 8]) so no batch is a tiny leftover call
+    num_batches = max(1, -(-num_questions // batch_size))
+    base, extra = divmod(num_questions, num_batches)
+    return [base + 1 if i < extra else base for i in range(num_batches)]
+
+
+def question_key(question):
+    text = question.get("question", "") if isinstance(question, dict) else str(question)
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def merge_questions(batches, limit):
+    merged = []
+    seen = set()
+    for questions in batches:
+        for question in questions:
+            key = question_key(question)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            merged.append(question)
+    return merged[:limit]
+
+
+def generate_quiz_batched(contexts, num_questions, generate_batch, batch_size=QUIZ_BATCH_SIZE,
+                          max_in_flight=MAX_IN_FLIGHT):
+    # generate_batch(context, n) returns a list of question dicts or raises.
+    # Batch i is grounded in contexts[i]; a retried batch moves on to the next
+    # context so a chunk that keeps producing bad output does not sink it.
+    sizes = split_batches(num_questions, batch_size)
+    results = {}
+    errors = {}
+    pending = list(range(len(sizes)))
+
+    for attempt in range(MAX_BATCH_ATTEMPTS):
+        if not pending:
+            break
+        with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+            futures = {
+                pool.submit(generate_batch, contexts[(i + attempt) % len(contexts)], sizes[i]): i
+                for i in pending
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                    errors.pop(i, None)
+                except Exception as e:
+                    errors[i] = e
+        pending = [i for i in pending if i not in results]
+
+    questions = merge_questions((results[i] for i in sorted(results)), num_questions)
+    return questions, [errors[i] for i in pending]
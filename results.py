@@ -0,0 +1,154 @@
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+import backend_client
+from cache import LRUCache
+
+
+RESULTS_PAGE_SIZE = 500
+PAGE_TTL_SECONDS = 300
+SCORE_BINS = 10  # Score distribution in 10-point percentage buckets
+# Identify an attempt when the backend sends no attempt_id
+ATTEMPT_KEY_FIELDS = ("quiz_id", "student", "retest_number", "submitted_at")
+
+# Raw pages keyed by token, page number and page size
+_page_cache = LRUCache(max_items=2000, max_bytes=256 * 1024 * 1024)
+
+
+def fetch_results_page(page, page_size=RESULTS_PAGE_SIZE, token=None, refresh=False):
+    # POST /find_results {"page", "page_size"} -> {"attempts": [...], "next_page": int | null}
+    token = token if token is not None else backend_client.current_token()
+    key = f"{token}:{page}:{page_size}"
+    cached = None if refresh else _page_cache.get(key)
+    if cached is not None and time.time() - cached[0] < PAGE_TTL_SECONDS:
+        return cached[1]
+
+    response = backend_client.post("/find_results", json={"page": page, "page_size": page_size}, token=token)
+    response.raise_for_status()
+    payload = response.json()
+    if "next_page" not in payload:
+        # Older backends only page implicitly: a full page means there may be more
+        payload["next_page"] = page + 1 if len(payload.get("attempts", [])) >= page_size else None
+    _page_cache.put(key, (time.time(), payload), size=len(response.content))
+    return payload
+
+
+def attempt_key(attempt):
+    # Stable across re-fetches of the same page, so an attempt is only counted once
+    if attempt.get("attempt_id") is not None:
+        return f"id:{attempt['attempt_id']}"
+    fields = {field: attempt.get(field) for field in ATTEMPT_KEY_FIELDS if field in attempt}
+    return json.dumps(fields or attempt, sort_keys=True, default=str)
+
+
+def _fold(total, new):
+    # Either side may be None: nothing seen yet, or nothing to add from this page
+    if new is None:
+        return total
+    return new if total is None else total.add(new, fill_value=0)
+
+
+class ResultsAggregator:
+    # Running sums per quiz, group and topic. Each page is summarised with one
+    # vectorized groupby and added to the totals, so new pages never trigger a
+    # recomputation over everything seen before. Attempts are counted once
+    # even if a page is fetched again, keyed by attempt_key.
+    def __init__(self):
+        self.by_quiz = None
+        self.by_group = None
+        self.by_topic = None
+        self.attempts = 0
+        self._seen = set()
+
+    def add_page(self, attempts):
+        frame = pd.DataFrame(attempts)
+        if frame.empty:
+            return 0
+        keys = pd.Series([attempt_key(attempt) for attempt in attempts], index=frame.index)
+        new = ~keys.isin(self._seen) & ~keys.duplicated()
+        frame = frame[new]
+        self._seen.update(keys[new])
+        if frame.empty:
+            return 0
+        for column, default in (("quiz_id", ""), ("quiz_name", ""), ("group", ""), ("retest_number", 0),
+                                ("score", np.nan), ("total_marks", np.nan)):
+            if column not in frame:
+                frame[column] = default
+        # Null keys would otherwise be dropped by groupby while still counted in self.attempts
+        for column in ("quiz_id", "quiz_name", "group"):
+            frame[column] = frame[column].fillna("")
+
+        total_marks = pd.to_numeric(frame["total_marks"], errors="coerce").replace(0, np.nan)
+        frame["pct"] = (pd.to_numeric(frame["score"], errors="coerce") / total_marks * 100).clip(0, 100)
+        frame = frame.dropna(subset=["pct"])
+        if frame.empty:
+            return 0
+        frame["pct_sq"] = frame["pct"] ** 2
+        frame["is_retest"] = (pd.to_numeric(frame["retest_number"], errors="coerce").fillna(0) > 0).astype(int)
+        frame["bin"] = np.minimum(frame["pct"] // (100 / SCORE_BINS), SCORE_BINS - 1).astype(int)
+
+        self.by_quiz = _fold(self.by_quiz, self._summarize(frame, ["quiz_id", "quiz_name"]))
+        self.by_group = _fold(self.by_group, self._summarize(frame, ["group"]))
+        if "answers" in frame:
+            self.by_topic = _fold(self.by_topic, self._summarize_topics(frame["answers"]))
+        self.attempts += len(frame)
+        return len(frame)
+
+    @staticmethod
+    def _summarize(frame, keys):
+        stats = frame.groupby(keys).agg(
+            attempts=("pct", "size"),
+            pct_sum=("pct", "sum"),
+            pct_sq_sum=("pct_sq", "sum"),
+            retests=("is_retest", "sum"),
+        )
+        bins = pd.crosstab([frame[key] for key in keys], frame["bin"])
+        bins = bins.reindex(columns=range(SCORE_BINS), fill_value=0)
+        bins.columns = [f"bin_{i}" for i in range(SCORE_BINS)]
+        return stats.join(bins).astype(float)
+
+    @staticmethod
+    def _summarize_topics(answers):
+        # answers: per attempt, a list of {"topic", "correct"}
+        flat = answers.explode().dropna()
+        if flat.empty:
+            return None
+        answers = pd.DataFrame(flat.tolist())
+        if "topic" not in answers or "correct" not in answers:
+            return None
+        answers["correct"] = answers["correct"].astype(bool).astype(int)
+        return answers.groupby("topic").agg(answered=("correct", "size"), correct=("correct", "sum")).astype(float)
+
+    def _derive(self, totals):
+        if totals is None:
+            return pd.DataFrame()
+        mean = totals["pct_sum"] / totals["attempts"]
+        variance = (totals["pct_sq_sum"] / totals["attempts"] - mean ** 2).clip(lower=0)
+        return pd.DataFrame({
+            "attempts": totals["attempts"].astype(int),
+            "mean_score_pct": mean.round(1),
+            "std_score_pct": np.sqrt(variance).round(1),
+            "retest_rate": (totals["retests"] / totals["attempts"]).round(3),
+        }).sort_values("attempts", ascending=False)
+
+    def quiz_stats(self):
+        return self._derive(self.by_quiz)
+
+    def group_stats(self):
+        return self._derive(self.by_group)
+
+    def score_distribution(self, quiz_key):
+        row = self.by_quiz.loc[quiz_key]
+        labels = [f"{i * 100 // SCORE_BINS}-{(i + 1) * 100 // SCORE_BINS}%" for i in range(SCORE_BINS)]
+        return pd.Series([int(row[f"bin_{i}"]) for i in range(SCORE_BINS)], index=labels, name="attempts")
+
+    def weakest_topics(self, min_answers=5, limit=10):
+        if self.by_topic is None:
+            return pd.DataFrame()
+        topics = self.by_topic[self.by_topic["answered"] >= min_answers]
+        accuracy = (topics["correct"] / topics["answered"]).round(3)
+        return pd.DataFrame({"answered": topics["answered"].astype(int), "accuracy": accuracy}) \
+            .sort_values("accuracy").head(limit)
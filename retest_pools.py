@@ -0,0 +1,106 @@
+import math
+from collections import Counter
+
+import numpy as np
+
+from quiz_scheduler import generate_quiz_batched, question_key
+from vector_index import extract_vectors, normalize_rows
+
+
+# Ask for a little more than the pools need; duplicates are dropped when dealing
+POOL_OVERSHOOT = 1.2
+# Chunks offered per topic, and how much more weight a weak topic gets
+TOPIC_CONTEXTS = 4
+WEAK_TOPIC_WEIGHT = 2.0
+
+
+def rank_chunks_for_topics(vector_store, embeddings, topics, k=TOPIC_CONTEXTS):
+    # Chunk texts most similar to each topic name, using the vectors FAISS
+    # already holds: one embedding call for the topics, one matrix product
+    vectors, docs = extract_vectors(vector_store)
+    similarity = normalize_rows(embeddings.embed_documents(list(topics))) @ normalize_rows(vectors).T
+    k = min(k, len(docs))
+    top = np.argsort(-similarity, axis=1, kind="stable")[:, :k]
+    return {topic: [docs[i].page_content for i in row] for topic, row in zip(topics, top)}
+
+
+def allocate_slots(topic_weights, pool_size):
+    # Largest-remainder split of pool_size slots in proportion to the weights
+    total = sum(topic_weights.values())
+    if not total or pool_size <= 0:
+        return {}
+    exact = {topic: pool_size * weight / total for topic, weight in topic_weights.items()}
+    slots = {topic: int(share) for topic, share in exact.items()}
+    by_remainder = sorted(exact, key=lambda topic: exact[topic] - slots[topic], reverse=True)
+    for topic in by_remainder[:pool_size - sum(slots.values())]:
+        slots[topic] += 1
+    return {topic: count for topic, count in slots.items() if count}
+
+
+def deal_pools(candidates, slots, num_pools, pool_size, exclude=()):
+    # candidates: topic -> generated questions. Every question lands in at most
+    # one pool and never repeats one in exclude (the original quiz). Each pool
+    # takes its share of every topic first; pools still short are then topped
+    # up from whatever is left over.
+    seen = {question_key(question) for question in exclude}
+    pools = [[] for _ in range(num_pools)]
+    leftovers = []
+    for topic, questions in candidates.items():
+        taken = [0] * num_pools
+        turn = 0
+        for question in questions:
+            key = question_key(question)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            open_pools = [i for i in range(num_pools) if taken[i] < slots.get(topic, 0)]
+            if not open_pools:
+                leftovers.append(question)
+                continue
+            pool = min(open_pools, key=lambda i: (taken[i], (i - turn) % num_pools))
+            pools[pool].append(question)
+            taken[pool] += 1
+            turn = pool + 1
+    for question in leftovers:
+        short = [pool for pool in pools if len(pool) < pool_size]
+        if not short:
+            break
+        min(short, key=len).append(question)
+    return pools
+
+
+def build_retest_pools(questions, num_pools, topic_contexts, generate_batch, weak_topics=(), check_cancelled=None):
+    # questions: the assigned quiz. Builds num_pools disjoint pools of the same
+    # size, spread over its topics in the same proportions (weak topics
+    # weighted up). topic_contexts maps each topic to context strings and
+    # generate_batch(context, n) returns question dicts, as for
+    # generate_quiz_batched. Returns (pools, warnings).
+    pool_size = len(questions)
+    weights = Counter(question.get("topic") or "General" for question in questions)
+    for topic in weak_topics:
+        if topic in weights:
+            weights[topic] *= WEAK_TOPIC_WEIGHT
+    slots = allocate_slots(weights, pool_size)
+
+    candidates = {}
+    warnings = []
+    for topic, count in slots.items():
+        if check_cancelled is not None:
+            check_cancelled()
+        contexts = topic_contexts.get(topic)
+        if not contexts:
+            warnings.append(f"No material found for topic '{topic}'.")
+            continue
+        wanted = math.ceil(count * num_pools * POOL_OVERSHOOT)
+        generated, errors = generate_quiz_batched(contexts, wanted, generate_batch)
+        for question in generated:
+            question.setdefault("topic", topic)
+        candidates[topic] = generated
+        if errors:
+            warnings.append(f"{len(errors)} batch(es) for topic '{topic}' failed.")
+
+    pools = deal_pools(candidates, slots, num_pools, pool_size, exclude=questions)
+    short = [i + 1 for i, pool in enumerate(pools) if len(pool) < pool_size]
+    if short:
+        warnings.append(f"Retest pool(s) {', '.join(map(str, short))} have fewer than {pool_size} questions.")
+    return pools, warnings
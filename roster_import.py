@@ -0,0 +1,132 @@
+import io
+import re
+import csv
+
+import backend_client
+
+
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+EMAIL_COLUMNS = {"email", "e-mail", "email address", "mail", "student email"}
+GROUP_COLUMNS = {"group", "group name", "group_name", "class", "section"}
+# /t-addgroup requests in flight at once during an import
+ADDGROUP_CONCURRENCY = 4
+# Tried in order; Excel on Windows saves "CSV" as cp1252, and latin-1 accepts any bytes
+CSV_ENCODINGS = ("utf-8-sig", "cp1252", "latin-1")
+
+
+class RosterError(ValueError):
+    pass
+
+
+def _decode(data):
+    for encoding in CSV_ENCODINGS:
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+
+
+def _iter_csv(uploaded_file):
+    # Rosters are small, so the file is decoded whole to pick an encoding that fits
+    try:
+        yield from csv.reader(io.StringIO(_decode(uploaded_file.getvalue()), newline=""))
+    except csv.Error as e:
+        raise RosterError(f"Could not read the CSV file: {e}") from e
+
+
+def _iter_xlsx(uploaded_file):
+    try:
+        from openpyxl import load_workbook  # Only needed for spreadsheet rosters
+    except ImportError as e:
+        raise RosterError("XLSX rosters need the openpyxl package; upload a CSV instead.") from e
+
+    try:
+        workbook = load_workbook(uploaded_file, read_only=True, data_only=True)
+    except Exception as e:
+        raise RosterError(f"Could not open the spreadsheet: {e}") from e
+    try:
+        for row in workbook.active.iter_rows(values_only=True):
+            yield ["" if cell is None else str(cell) for cell in row]
+    except Exception as e:
+        raise RosterError(f"Could not read the spreadsheet: {e}") from e
+    finally:
+        workbook.close()
+
+
+def iter_roster_rows(uploaded_file):
+    # Yields (row_number, email, group) one row at a time. The header row is
+    # optional: without one, the first column holding an email is used. Rows
+    # before the header or first email (titles, notes) are skipped. Raises
+    # RosterError if the file cannot be read.
+    rows = _iter_xlsx(uploaded_file) if uploaded_file.name.lower().endswith(".xlsx") else _iter_csv(uploaded_file)
+    email_col = group_col = None
+    for row_number, row in enumerate(rows, start=1):
+        cells = [cell.strip() for cell in row]
+        if not any(cells):
+            continue
+        if email_col is None:
+            header = [cell.lower() for cell in cells]
+            email_col = next((i for i, name in enumerate(header) if name in EMAIL_COLUMNS), None)
+            group_col = next((i for i, name in enumerate(header) if name in GROUP_COLUMNS), None)
+            if email_col is not None:
+                continue
+            email_col = next((i for i, cell in enumerate(cells) if "@" in cell), None)
+            if email_col is None:
+                continue
+        email = cells[email_col] if email_col < len(cells) else ""
+        group = cells[group_col] if group_col is not None and group_col < len(cells) else ""
+        yield row_number, email, group
+
+
+def parse_roster(rows, default_group=""):
+    # Returns ({group: [emails]}, report). Emails are deduplicated per group,
+    # case-insensitively; every row gets a report entry explaining its fate.
+    groups = {}
+    seen = {}
+    report = []
+    for row_number, email, group in rows:
+        group = group or default_group
+        entry = {"row": row_number, "email": email, "group": group, "status": "ok", "detail": ""}
+        if not group:
+            entry.update(status="error", detail="No group name")
+        elif not EMAIL_RE.match(email):
+            entry.update(status="error", detail="Invalid email address")
+        elif email.lower() in seen.setdefault(group, set()):
+            entry.update(status="skipped", detail="Duplicate email in group")
+        else:
+            seen[group].add(email.lower())
+            groups.setdefault(group, []).append(email)
+        report.append(entry)
+    return groups, report
+
+
+def submit_groups(groups, token=None, concurrency=ADDGROUP_CONCURRENCY):
+    # One /t-addgroup call per group, fanned out over the shared connection pool
+    names = list(groups)
+    calls = [{"path": "/t-addgroup", "json": {"group_name": name, "users": groups[name]}, "token": token}
+             for name in names]
+    outcomes = {}
+    for name, response in zip(names, backend_client.post_many_sync(calls, concurrency=concurrency)):
+        if isinstance(response, Exception):
+            outcomes[name] = (False, f"Error connecting to server: {response}")
+        elif response.status_code == 200:
+            outcomes[name] = (True, "")
+        else:
+            outcomes[name] = (False, response.text)
+    return outcomes
+
+
+def apply_outcomes(report, outcomes):
+    for entry in report:
+        if entry["status"] == "ok" and entry["group"] in outcomes:
+            ok, detail = outcomes[entry["group"]]
+            entry.update(status="added" if ok else "failed", detail=detail)
+    return report
+
+
+def report_csv(report):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=["row", "email", "group", "status", "detail"])
+    writer.writeheader()
+    writer.writerows(report)
+    return out.getvalue()
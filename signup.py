@@ -1,9 +1,7 @@
 import streamlit as st
 import requests
 import time
-
-# URL for your Express server (adjust as needed)
-BASE_URL = "http://localhost:3540"
+import backend_client
 
 def show_signup():
     st.title("Instructor Signup")
@@ -24,7 +22,7 @@ def show_signup():
 
             try:
                 # Send POST request to the Express signup route
-                response = requests.post(f"{BASE_URL}/t-signup", json=payload)
+                response = backend_client.post("/t-signup", json=payload, auth=False)
                 data = response.json()
 
                 # Check for success response from the server
@@ -0,0 +1,168 @@
+import os
+import time
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Histogram buckets in seconds, from a cache hit up to a slow 50-question generation
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = [(k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for k, v in pairs]
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+class Metrics:
+    # Process-wide counters and histograms, rendered in the Prometheus text format
+    def __init__(self, recent_spans=200):
+        self._lock = threading.Lock()
+        self.counters = defaultdict(float)  # (name, label key) -> value
+        self.histograms = {}  # (name, label key) -> [bucket counts, sum, count]
+        self.recent = deque(maxlen=recent_spans)
+
+    def inc(self, name, value=1, **labels):
+        with self._lock:
+            self.counters[(name, _label_key(labels))] += value
+
+    def observe(self, name, value, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self.histograms.setdefault(key, [[0] * len(BUCKETS), 0.0, 0])
+            for i, bound in enumerate(BUCKETS):
+                if value <= bound:
+                    histogram[0][i] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def counter_value(self, name, **labels):
+        with self._lock:
+            return self.counters.get((name, _label_key(labels)), 0.0)
+
+    def counter_total(self, name):
+        # Sum of a counter across all label sets
+        with self._lock:
+            return sum(value for (counter, _), value in self.counters.items() if counter == name)
+
+    def render(self):
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted((key, (list(h[0]), h[1], h[2])) for key, h in self.histograms.items())
+
+        typed = set()
+        for (name, key), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{_format_labels(key)} {value:g}")
+
+        for (name, key), (buckets, total, count) in histograms:
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            for bound, bucket_count in zip(BUCKETS, buckets):
+                lines.append(f"{name}_bucket{_format_labels(key, [('le', f'{bound:g}')])} {bucket_count}")
+            lines.append(f"{name}_bucket{_format_labels(key, [('le', '+Inf')])} {count}")
+            lines.append(f"{name}_sum{_format_labels(key)} {total:g}")
+            lines.append(f"{name}_count{_format_labels(key)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def stage_summary(self):
+        # Rows for the admin panel: one per stage duration series
+        with self._lock:
+            items = [(key, h[1], h[2]) for (name, key), h in self.histograms.items()
+                     if name == "stage_duration_seconds"]
+        return [
+            {**dict(key), "calls": count, "mean_s": round(total / count, 4), "total_s": round(total, 3)}
+            for key, total, count in sorted(items)
+        ]
+
+
+metrics = Metrics()
+
+
+@contextmanager
+def span(stage, **labels):
+    # Times a block (or, as a decorator, a function) as one pipeline stage
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        metrics.observe("stage_duration_seconds", duration, stage=stage, status=status, **labels)
+        metrics.recent.append({"stage": stage, "status": status, "duration_s": round(duration, 4),
+                               "at": time.strftime("%H:%M:%S"), **labels})
+
+
+def record_cache(cache, result):
+    metrics.inc("cache_requests_total", cache=cache, result=result)
+
+
+def cache_hit_rate(cache):
+    # Any result other than "miss" (hit, memory_hit, disk_hit) counts as a hit
+    with metrics._lock:
+        results = [(dict(key)["result"], value) for (name, key), value in metrics.counters.items()
+                   if name == "cache_requests_total" and dict(key)["cache"] == cache]
+    total = sum(value for _, value in results)
+    hits = sum(value for result, value in results if result != "miss")
+    return hits / total if total else None
+
+
+def record_token_usage(usage, model):
+    if usage is None:
+        return
+    for field in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        value = getattr(usage, field, None)
+        if value is None and isinstance(usage, dict):
+            value = usage.get(field)
+        if value:
+            metrics.inc(f"llm_{field}_total", value, model=model)
+    metrics.inc("llm_requests_total", model=model)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=None):
+    # Serves /metrics for Prometheus once per process; METRICS_PORT unset means off
+    global _server
+    port = port or os.getenv("METRICS_PORT")
+    if not port:
+        return None
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((os.getenv("METRICS_HOST", "127.0.0.1"), int(port)), _MetricsHandler)
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+        return _server
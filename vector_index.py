@@ -0,0 +1,150 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+UPSERT_BATCH_SIZE = 100
+# Pinecone caps metadata at 40KB per vector and a request at 2MB, both in
+# bytes; chunk text is cut by its UTF-8 length and batches by serialized size
+MAX_METADATA_TEXT_BYTES = 32 * 1024
+MAX_REQUEST_BYTES = 1800 * 1024
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="vector-upsert")
+
+
+def extract_vectors(vector_store):
+    # Reads back the vectors FAISS already holds instead of re-encoding the chunks
+    index = vector_store.index
+    vectors = index.reconstruct_n(0, index.ntotal)
+    doc_ids = [vector_store.index_to_docstore_id[i] for i in range(index.ntotal)]
+    docs = [vector_store.docstore.search(doc_id) for doc_id in doc_ids]
+    return vectors, docs
+
+
+def truncate_utf8(text, max_bytes):
+    encoded = text.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return text
+    return encoded[:max_bytes].decode("utf-8", "ignore")
+
+
+def iter_record_batches(records, batch_size=UPSERT_BATCH_SIZE, max_bytes=MAX_REQUEST_BYTES):
+    # At most batch_size records and roughly max_bytes of JSON per request.
+    # json.dumps escapes non-ASCII, so the estimate errs on the large side.
+    batch = []
+    size = 0
+    for record in records:
+        record_size = len(json.dumps(record)) + 1
+        if batch and (len(batch) >= batch_size or size + record_size > max_bytes):
+            yield batch
+            batch = []
+            size = 0
+        batch.append(record)
+        size += record_size
+    if batch:
+        yield batch
+
+
+def normalize_rows(vectors):
+    # Unit-length rows so dot products are cosine similarities; zero rows stay zero
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def build_records(vector_store, document_id, user_id=None):
+    vectors, docs = extract_vectors(vector_store)
+    records = []
+    for i, (vector, doc) in enumerate(zip(vectors, docs)):
+        metadata = dict(doc.metadata or {})
+        metadata.update({
+            "document_id": document_id,
+            "chunk_index": i,
+            "text": truncate_utf8(doc.page_content, MAX_METADATA_TEXT_BYTES),
+        })
+        if user_id:
+            metadata["user_id"] = user_id
+        records.append({"id": f"{document_id}-{i}", "values": vector.tolist(), "metadata": metadata})
+    return records
+
+
+def upsert_document_vectors(index, vector_store, document_id, user_id=None, batch_size=UPSERT_BATCH_SIZE):
+    records = build_records(vector_store, document_id, user_id)
+    for batch in iter_record_batches(records, batch_size):
+        index.upsert(vectors=batch, namespace=document_id)
+    return len(records)
+
+
+def upsert_in_background(index, vector_store, document_id, user_id=None):
+    future = _executor.submit(upsert_document_vectors, index, vector_store, document_id, user_id)
+
+    def report(done):
+        if done.exception() is not None:
+            print(f"Vector upsert for document {document_id} failed: {done.exception()}")
+
+    future.add_done_callback(report)
+    return future
+
+
+class InMemoryIndex:
+    # Local stand-in for pinecone.Index covering the calls this app makes, for
+    # tests and offline runs (PINECONE_INDEX_BACKEND=memory)
+    def __init__(self):
+        self.namespaces = {}
+        self._lock = threading.Lock()
+
+    def upsert(self, vectors, namespace=""):
+        with self._lock:
+            store = self.namespaces.setdefault(namespace, {})
+            for record in vectors:
+                store[record["id"]] = (np.asarray(record["values"], dtype=np.float32),
+                                       dict(record.get("metadata") or {}))
+        return {"upserted_count": len(vectors)}
+
+    def fetch(self, ids, namespace=""):
+        with self._lock:
+            store = self.namespaces.get(namespace, {})
+            return {"vectors": {
+                vector_id: {"id": vector_id, "values": store[vector_id][0].tolist(), "metadata": store[vector_id][1]}
+                for vector_id in ids if vector_id in store
+            }}
+
+    def query(self, vector, top_k=10, namespace="", include_values=False, include_metadata=False, **kwargs):
+        with self._lock:
+            items = list(self.namespaces.get(namespace, {}).items())
+        if not items:
+            return {"matches": []}
+
+        matrix = np.stack([values for _, (values, _) in items])
+        query = np.asarray(vector, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        scores = matrix @ query / np.where(norms == 0, 1, norms)
+        top = np.argsort(-scores)[:top_k]
+
+        matches = []
+        for i in top:
+            vector_id, (values, metadata) = items[i]
+            match = {"id": vector_id, "score": float(scores[i])}
+            if include_values:
+                match["values"] = values.tolist()
+            if include_metadata:
+                match["metadata"] = metadata
+            matches.append(match)
+        return {"matches": matches}
+
+    def delete(self, ids=None, delete_all=False, namespace=""):
+        with self._lock:
+            if delete_all:
+                self.namespaces.pop(namespace, None)
+            else:
+                store = self.namespaces.get(namespace, {})
+                for vector_id in ids or []:
+                    store.pop(vector_id, None)
+        return {}
+
+    def describe_index_stats(self):
+        with self._lock:
+            namespaces = {name: {"vector_count": len(store)} for name, store in self.namespaces.items()}
+        return {"namespaces": namespaces, "total_vector_count": sum(n["vector_count"] for n in namespaces.values())}
@@ -0,0 +1,84 @@
+import time
+
+import requests
+import streamlit as st
+
+from results import ResultsAggregator, fetch_results_page
+
+# Pages fetched per script run before the partial aggregates are drawn and the
+# script reruns to fetch more, so large result sets show up progressively
+LOAD_SLICE_SECONDS = 1.0
+
+
+def _results_state():
+    if 'results_view' not in st.session_state:
+        st.session_state.results_view = {"aggregator": ResultsAggregator(), "next_page": 1, "last_page": 1,
+                                         "done": False, "error": None}
+    return st.session_state.results_view
+
+
+def _load_pages(state, refresh=False):
+    # Folds pages into the running aggregates until the time slice runs out
+    deadline = time.monotonic() + LOAD_SLICE_SECONDS
+    while not state["done"] and time.monotonic() < deadline:
+        page = state["next_page"]
+        try:
+            payload = fetch_results_page(page, refresh=refresh)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            state["error"] = str(e)
+            state["done"] = True
+            return
+        refresh = False
+        state["aggregator"].add_page(payload.get("attempts", []))
+        state["last_page"] = page
+        if payload.get("next_page"):
+            state["next_page"] = payload["next_page"]
+        else:
+            state["done"] = True
+
+
+def show_view_results():
+    st.subheader("View Quiz Results")
+    state = _results_state()
+
+    refresh = False
+    if st.button("Check for new attempts"):
+        # Resume from the last page seen; attempts already counted are skipped
+        state.update(next_page=state["last_page"], done=False, error=None)
+        refresh = True
+
+    if not state["done"]:
+        _load_pages(state, refresh=refresh)
+
+    aggregator = state["aggregator"]
+    if state["error"]:
+        st.error(f"Could not load results: {state['error']}")
+    if not state["done"]:
+        st.info(f"Loading results... {aggregator.attempts} attempts so far.")
+    if aggregator.attempts == 0:
+        if state["done"] and not state["error"]:
+            st.write("No quiz attempts yet.")
+    else:
+        st.metric("Attempts", aggregator.attempts)
+        by_quiz, by_group, by_topic = st.tabs(["By quiz", "By group", "Weakest topics"])
+
+        with by_quiz:
+            quiz_stats = aggregator.quiz_stats()
+            st.dataframe(quiz_stats)
+            quiz = st.selectbox("Score distribution for", list(quiz_stats.index),
+                                format_func=lambda key: key[1] or key[0])
+            if quiz is not None:
+                st.bar_chart(aggregator.score_distribution(quiz))
+
+        with by_group:
+            st.dataframe(aggregator.group_stats())
+
+        with by_topic:
+            weakest = aggregator.weakest_topics()
+            if weakest.empty:
+                st.write("No per-topic answers recorded yet.")
+            else:
+                st.dataframe(weakest)
+
+    if not state["done"]:
+        st.rerun()